@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Prüft images/ gegen die Original-Bilder und die Seiten, die sie einbinden.
+
+Liest images/ in einem einzigen Durchlauf ein und gleicht ab:
+- Originale (images/*.jpg|jpeg|png, images/maps/*_map.png) und die Varianten,
+  die convert_image.py daraus erzeugt (compressed/, thumbs/, tiny/, maps/*.webp)
+- alle Bild-Pfade in den HTML-Seiten des Repos und in data/shows.json
+
+Gemeldet werden:
+- verwaiste Varianten ohne Original (z.B. thumbs/undine.avif)
+- fehlende Varianten eines Originals
+- Originale, die keine Seite benutzt (samt ihrer Varianten)
+- Verweise auf Bilder, die es nicht gibt
+- Varianten über dem Byte-Budget ihres Ordners (BUDGETS_KB)
+
+Verwendung:
+    python "Image Conversion/audit_images.py"
+    python "Image Conversion/audit_images.py" --budget 200   # 200 KB für alle Ordner
+    python "Image Conversion/audit_images.py" index.html shows.html
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import convert_image  # noqa: E402
+from convert_image import IMAGES_DIR, REPO_ROOT, source_widths, variant_names  # noqa: E402
+
+# Budget je Ausgabe-Ordner in KB, knapp über den heutigen Spitzenwerten
+# (compressed 674, thumbs 159, tiny 1, maps 10 KB), damit Ausreißer auffallen
+BUDGETS_KB = {
+    "compressed": 800,
+    "thumbs": 200,
+    "tiny": 2,
+    "maps": 20,
+}
+
+ORIGINAL_SUFFIXES = ('.jpg', '.jpeg', '.png')
+VARIANT_DIRS = ('compressed', 'thumbs', 'tiny', 'maps')
+
+# Bild-Pfade in HTML, CSS und JSON; ${base}-Vorlagen im JS passen nicht
+IMAGE_PATH_RE = re.compile(r'images/[A-Za-z0-9_.\-/]+?\.(?:jpe?g|png|avif|webp|gif|svg)\b', re.I)
+
+
+def scan(root: Path = None) -> dict:
+    """{Pfad relativ zu images/: Größe in Bytes} - ein Durchlauf über images/."""
+    root = root or IMAGES_DIR
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        rel_dir = Path(dirpath).relative_to(root)
+        for filename in filenames:
+            if filename.startswith('.'):
+                continue
+            path = Path(dirpath) / filename
+            files[(rel_dir / filename).as_posix()] = path.stat().st_size
+    return files
+
+
+def originals(files: dict) -> dict:
+    """{Basis-Name: Pfad} der Originale in images/ und der Tiefenkarten in images/maps/."""
+    found = {}
+    for rel in files:
+        path = Path(rel)
+        if len(path.parts) == 1 and path.suffix.lower() in ORIGINAL_SUFFIXES:
+            found[path.stem] = rel
+        elif path.parent.as_posix() == 'maps' and convert_image.is_depth_map(path):
+            found[f"maps/{path.stem}"] = rel
+    return found
+
+
+def expected_variants(sources: dict, manifest: dict) -> dict:
+    """
+    {Varianten-Pfad: (Basis-Name des Originals, Varianten-Name)}.
+
+    Die srcset-Breiten kommen aus dem Manifest; nur für Originale ohne
+    Eintrag wird der Bild-Header gelesen.
+    """
+    expected = {}
+    layout = convert_image.OutputDirs.under(Path())
+    for base, rel in sources.items():
+        if base.startswith('maps/'):
+            expected[f"maps/{Path(rel).stem}.webp"] = (base, 'maps.webp')
+            continue
+        record = manifest.get(Path(rel).name)
+        widths = record["widths"] if record and "widths" in record else source_widths(IMAGES_DIR / rel)
+        for name in variant_names(widths):
+            expected[layout.path(base, name).as_posix()] = (base, name)
+    return expected
+
+
+def page_references(pages: list) -> dict:
+    """{Pfad relativ zu images/: [Seiten]} aller Bild-Pfade in den Seiten."""
+    references = {}
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if page.suffix == '.json':
+            # Nur die Werte, damit Schlüssel und Escapes nicht stören
+            content = '\n'.join(json_strings(json.loads(content)))
+        for match in IMAGE_PATH_RE.finditer(content):
+            rel = match.group(0)[len('images/'):]
+            references.setdefault(rel, []).append(os.path.relpath(page, REPO_ROOT))
+    return {rel: sorted(set(pages)) for rel, pages in references.items()}
+
+
+def json_strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from json_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from json_strings(item)
+
+
+def family(rel: str) -> str:
+    """Basis-Name, den ein Pfad in images/ trägt (ohne Ordner, -<breite>w und _map)."""
+    stem = re.sub(r'-\d+w$', '', Path(rel).stem)
+    return stem[:-len('_map')] if stem.endswith('_map') else stem
+
+
+def audit(pages: list, budgets: dict):
+    """
+    Returns:
+        ({Art: [(Pfad, Bytes, Hinweis)]}, entfernbare Bytes)
+    """
+    files = scan()
+    sources = originals(files)
+    expected = expected_variants(sources, convert_image.load_manifest())
+    references = page_references(pages)
+
+    # Ein Bild gilt samt Varianten und Tiefenkarte als benutzt, wenn eine
+    # Seite irgendeine seiner Dateien einbindet (shows.html leitet z.B. aus
+    # images/<name>.jpg in shows.json die Thumbnails ab)
+    used = {family(rel) for rel in references if rel in files}
+
+    findings = {"orphans": [], "missing": [], "unused": [], "broken": [], "oversize": []}
+    removable = 0
+    for rel, referenced_by in sorted(references.items()):
+        if rel not in files:
+            findings["broken"].append((rel, 0, ', '.join(referenced_by)))
+
+    for rel, size in sorted(files.items()):
+        parts = Path(rel).parts
+        if len(parts) < 2 or parts[0] not in VARIANT_DIRS:
+            continue
+        if rel not in expected and rel not in sources.values():
+            if family(rel) in used:
+                note = "benutzt"
+            else:
+                note = "nicht benutzt"
+                removable += size
+            findings["orphans"].append((rel, size, note))
+        elif rel in sources.values() and family(rel) not in sources:
+            # Tiefenkarte, deren Bild kein Original mehr hat
+            note = "Tiefenkarte ohne Original, benutzt" if family(rel) in used else "Tiefenkarte ohne Original"
+            removable += 0 if family(rel) in used else size
+            findings["orphans"].append((rel, size, note))
+        budget = budgets.get(parts[0])
+        if budget and size > budget * 1024 and rel not in sources.values():
+            findings["oversize"].append((rel, size, f"Budget {budget} KB"))
+
+    missing = {}
+    for rel, (base, name) in expected.items():
+        if rel not in files:
+            missing.setdefault(base, []).append(name)
+    for base, names in sorted(missing.items()):
+        findings["missing"].append((sources[base], 0, ', '.join(names)))
+
+    for base, rel in sorted(sources.items()):
+        if family(rel) in used or family(rel) not in sources:
+            continue
+        owned = [rel] + [path for path, (owned_by, _) in expected.items() if owned_by == base]
+        size = sum(files.get(path, 0) for path in owned)
+        removable += size
+        findings["unused"].append((rel, size, f"{len(owned)} Dateien"))
+    return findings, removable
+
+
+TITLES = {
+    "orphans": "Verwaiste Varianten (kein Original)",
+    "missing": "Originale mit fehlenden Varianten",
+    "unused": "Originale, die keine Seite benutzt (inkl. Varianten)",
+    "broken": "Verweise auf fehlende Bilder",
+    "oversize": "Über dem Budget",
+}
+
+
+def print_report(findings: dict, removable: int):
+    for kind, title in TITLES.items():
+        entries = findings[kind]
+        if not entries:
+            print(f"✅ {title}: keine")
+            continue
+        size = sum(entry[1] for entry in entries)
+        print(f"\n⚠️  {title}: {len(entries)}" + (f" ({size / 1024:.0f} KB)" if size else ""))
+        for rel, entry_size, note in entries:
+            shown = f"{entry_size / 1024:>7.0f} KB  " if entry_size else " " * 12
+            print(f"   {shown}images/{rel}  ({note})")
+    print(f"\n{'='*40}")
+    print(f"Entfernbar: {removable / 1024 / 1024:.1f} MB (von keiner Seite benutzt)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prüft images/ auf verwaiste, fehlende und zu große Dateien")
+    parser.add_argument('pages', nargs='*',
+                        help='Seiten mit Bild-Verweisen (Standard: alle *.html und data/shows.json)')
+    parser.add_argument('--budget', type=int, metavar='KB',
+                        help='Byte-Budget in KB für alle Ordner statt BUDGETS_KB')
+    args = parser.parse_args()
+
+    pages = [Path(p).resolve() for p in args.pages] or (
+        sorted(REPO_ROOT.glob('*.html')) + [REPO_ROOT / 'data' / 'shows.json'])
+    budgets = {folder: args.budget for folder in BUDGETS_KB} if args.budget else BUDGETS_KB
+    print_report(*audit(pages, budgets))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark für convert_image.py
+
+jobs:     Konvertiert die Original-Bilder (Standard: images/*.jpg) in ein
+          temporäres Verzeichnis, einmal seriell und einmal mit --jobs N,
+          vergleicht die erzeugten Dateien Byte für Byte und gibt die
+          Laufzeiten aus.
+profiles: Kodiert eine Stichprobe in voller Größe als AVIF mit jedem
+          Encoder-Profil und gibt Zeit, Bytes, SSIM und PSNR gegenüber
+          dem Original aus.
+Die Varianten in images/ werden dabei nicht angefasst.
+
+Verwendung:
+    python "Image Conversion/benchmark_convert.py" jobs
+    python "Image Conversion/benchmark_convert.py" jobs --jobs 8 images/macbeth.jpg
+    python "Image Conversion/benchmark_convert.py" profiles --sample 6
+"""
+
+import argparse
+import contextlib
+import filecmp
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import convert_image  # noqa: E402
+from convert_image import Image  # noqa: E402
+from PIL import ImageChops, ImageMath, ImageStat  # noqa: E402
+
+# SSIM-Blockgröße und Konstanten (8-Bit: C1 = (0.01*255)², C2 = (0.03*255)²)
+SSIM_BLOCK = 8
+SSIM_C1 = 6.5025
+SSIM_C2 = 58.5225
+
+
+def use_output_dir(root: Path) -> convert_image.OutputDirs:
+    """Ausgabe-Verzeichnisse und Manifest von convert_image unter root."""
+    dirs = convert_image.OutputDirs.under(root)
+    dirs.ensure()
+    return dirs
+
+
+def timed_run(paths: list, root: Path, jobs: int) -> float:
+    dirs = use_output_dir(root)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        convert_image.convert_all(paths, force=True, jobs=jobs, dirs=dirs)
+    return time.perf_counter() - start
+
+
+def differing_files(a: Path, b: Path) -> list:
+    """Relative Pfade aller Dateien, die sich zwischen a und b unterscheiden."""
+    names = {p.relative_to(a) for p in a.rglob('*') if p.is_file()}
+    names |= {p.relative_to(b) for p in b.rglob('*') if p.is_file()}
+    return sorted(str(name) for name in names
+                  if not ((a / name).exists() and (b / name).exists()
+                          and filecmp.cmp(a / name, b / name, shallow=False)))
+
+
+def bench_jobs(paths: list, jobs: int):
+    print(f"{len(paths)} Bilder, {os.cpu_count()} Kerne\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        serial_dir, parallel_dir = Path(tmp) / "serial", Path(tmp) / "parallel"
+        serial = timed_run(paths, serial_dir, 1)
+        parallel = timed_run(paths, parallel_dir, jobs)
+        differing = differing_files(serial_dir, parallel_dir)
+
+    print(f"{'Modus':<12} {'Zeit':>8} {'pro Bild':>9}")
+    print(f"{'seriell':<12} {serial:>7.1f}s {serial / len(paths):>8.2f}s")
+    print(f"{f'--jobs {jobs}':<12} {parallel:>7.1f}s {parallel / len(paths):>8.2f}s")
+    print(f"\nSpeedup: {serial / parallel:.2f}x")
+    if differing:
+        print(f"❌ {len(differing)} Dateien unterscheiden sich: {', '.join(differing[:5])}")
+        sys.exit(1)
+    print("✅ Ausgabe identisch zur seriellen Konvertierung")
+
+
+def mean(img) -> float:
+    """Mittelwert eines F-Bildes."""
+    return img.resize((1, 1), Image.BOX).getpixel((0, 0))
+
+
+def ssim(a, b) -> float:
+    """
+    SSIM der Helligkeit über nicht überlappende SSIM_BLOCK-Blöcke.
+    
+    Die Block-Statistiken entstehen per BOX-Verkleinerung, so dass nur
+    Pillow gebraucht wird.
+    """
+    x = a.convert('L').convert('F')
+    y = b.convert('L').convert('F')
+    blocks = (max(1, x.width // SSIM_BLOCK), max(1, x.height // SSIM_BLOCK))
+    
+    def block_mean(img):
+        return img.resize(blocks, Image.BOX)
+    
+    def product(p, q):
+        return ImageMath.lambda_eval(lambda args: args['p'] * args['q'], p=p, q=q)
+    
+    mx, my = block_mean(x), block_mean(y)
+    xx, yy, xy = block_mean(product(x, x)), block_mean(product(y, y)), block_mean(product(x, y))
+    ssim_map = ImageMath.lambda_eval(
+        lambda v: ((2 * v['mx'] * v['my'] + SSIM_C1) * (2 * (v['xy'] - v['mx'] * v['my']) + SSIM_C2))
+        / ((v['mx'] * v['mx'] + v['my'] * v['my'] + SSIM_C1)
+           * ((v['xx'] - v['mx'] * v['mx']) + (v['yy'] - v['my'] * v['my']) + SSIM_C2)),
+        mx=mx, my=my, xx=xx, yy=yy, xy=xy)
+    return mean(ssim_map)
+
+
+def psnr(a, b) -> float:
+    """PSNR in dB über alle RGB-Kanäle."""
+    stat = ImageStat.Stat(ImageChops.difference(a, b))
+    mse = sum(stat.sum2) / (a.width * a.height * 3)
+    return float('inf') if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def sample(paths: list, count: int) -> list:
+    """count gleichmäßig verteilte Bilder aus paths."""
+    if count >= len(paths):
+        return paths
+    step = len(paths) / count
+    return [paths[int(i * step)] for i in range(count)]
+
+
+def bench_profiles(paths: list):
+    print(f"{len(paths)} Bilder in voller Größe, AVIF-Qualität {convert_image.AVIF_QUALITY}\n")
+    totals = {name: [0.0, 0, 0.0, 0.0] for name in convert_image.ENCODER_PROFILES}
+    for path in paths:
+        with Image.open(path) as img:
+            source = img.convert('RGB')
+        for name in convert_image.ENCODER_PROFILES:
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            source.save(buffer, 'AVIF', **convert_image.Settings.current(profile=name).avif_options())
+            seconds = time.perf_counter() - start
+            buffer.seek(0)
+            with Image.open(buffer) as encoded:
+                decoded = encoded.convert('RGB')
+            total = totals[name]
+            total[0] += seconds
+            total[1] += buffer.getbuffer().nbytes
+            total[2] += ssim(source, decoded)
+            total[3] += psnr(source, decoded)
+    
+    print(f"{'Profil':<10} {'Zeit':>8} {'Größe':>10} {'SSIM':>7} {'PSNR':>8}")
+    for name, (seconds, size, ssim_sum, psnr_sum) in totals.items():
+        settings = convert_image.ENCODER_PROFILES[name]
+        print(f"{name:<10} {seconds:>7.1f}s {size / 1024:>7.0f} KB {ssim_sum / len(paths):>7.4f}"
+              f" {psnr_sum / len(paths):>6.2f}dB  (speed {settings['avif_speed']},"
+              f" {settings['avif_subsampling']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für convert_image.py")
+    sub = parser.add_subparsers(dest='command', required=True)
+    jobs_parser = sub.add_parser('jobs', help='Seriell gegen Prozess-Pool')
+    jobs_parser.add_argument('images', nargs='*', help='Original-Bilder (Standard: images/*.jpg)')
+    jobs_parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1)
+    profiles_parser = sub.add_parser('profiles', help='Encoder-Profile: Zeit, Größe, SSIM/PSNR')
+    profiles_parser.add_argument('images', nargs='*', help='Original-Bilder (Standard: images/*.jpg)')
+    profiles_parser.add_argument('--sample', type=int, default=6,
+                                 help='Anzahl Bilder aus images/*.jpg (Standard: 6)')
+    args = parser.parse_args()
+
+    paths = sorted(Path(p) for p in args.images) or sorted(convert_image.IMAGES_DIR.glob('*.jpg'))
+    if args.command == 'jobs':
+        bench_jobs(paths, args.jobs)
+    elif args.command == 'profiles':
+        bench_profiles(paths if args.images else sample(paths, args.sample))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,40 @@
 Bild-Konvertierungs-Skript für susanneuhl.github.io
 
 Erstellt aus einem Original-Bild alle benötigten Varianten:
-- compressed/ (AVIF + JPG) - Volle Größe, optimiert
+- compressed/ (AVIF) - Volle Größe, optimiert
 - thumbs/ (AVIF + JPG) - Thumbnails für Grid
+- thumbs/<name>-<breite>w (AVIF + WebP + JPG) - Breiten für srcset (400/800w)
 - tiny/ (JPG) - LQIP Placeholder (sehr klein, für Blur-Effekt)
 
+Aus einer Tiefenkarte images/maps/<name>_map.png (Graustufen, von Hand
+erstellt) wird maps/<name>_map.webp - verkleinert, für den 3D-Effekt.
+
 Verwendung:
     python "Image Conversion/convert_image.py" bildname.jpg
     python "Image Conversion/convert_image.py" --all  # Alle Bilder in images/ konvertieren
+    python "Image Conversion/convert_image.py" --all --jobs 4  # Parallel auf 4 Kernen
+    python "Image Conversion/convert_image.py" --watch  # Neue Bilder sofort konvertieren
+    cat bild.jpg | python "Image Conversion/convert_image.py" - --stdout thumbs.avif > thumb.avif
+
+Als Bibliothek: encode_variants() kodiert ein Original (Pfad, Bytes oder
+Datei-Objekt) und liefert die Varianten als Variant(name, data, width, height),
+ohne etwas zu schreiben; Settings und OutputDirs ersetzen die Konstanten unten.
 """
 
+import io
 import os
+import json
+import base64
+import hashlib
+import signal
 import sys
+import time
 import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import NamedTuple
 
 try:
     from PIL import Image, ImageFilter
@@ -40,21 +61,178 @@ IMAGES_DIR = REPO_ROOT / "images"
 COMPRESSED_DIR = IMAGES_DIR / "compressed"
 THUMBS_DIR = IMAGES_DIR / "thumbs"
 TINY_DIR = IMAGES_DIR / "tiny"
+MAPS_DIR = IMAGES_DIR / "maps"
 
 # Einstellungen (basierend auf vorhandenen Bildern ermittelt)
-THUMB_MAX_HEIGHT = 1000  # Thumbnails: max 1000px Höhe
-TINY_MAX_HEIGHT = 20     # LQIP: max 20px Höhe (sehr klein für Blur-Effekt)
+THUMB_MAX_SIZE = 1000    # Thumbnails: max 1000px Breite und Höhe
+TINY_MAX_SIZE = 20       # LQIP: max 20px Breite und Höhe (sehr klein für Blur-Effekt)
+
+# Breiten für srcset im Grid (nur kleiner als das Thumbnail, kein Hochskalieren)
+THUMB_WIDTHS = (400, 800)
+
+# Qualitätseinstellungen; AVIF 45 entspricht mit dem heutigen libavif etwa
+# der Dateigröße der bisherigen Varianten, darüber wachsen die Dateien schnell
+AVIF_QUALITY = 45
+WEBP_QUALITY = 80
+JPG_QUALITY = 80
+
+# Encoder-Profile: AVIF-Geschwindigkeit (0 = langsam/klein, 10 = schnell),
+# Chroma-Subsampling und WebP-Aufwand (0-6). "balanced" = Encoder-Standard,
+# "max" = volle Farbauflösung (4:4:4) für die beste Bildqualität.
+# Vergleich: python "Image Conversion/benchmark_convert.py" profiles
+ENCODER_PROFILES = {
+    "fast": {"avif_speed": 8, "avif_subsampling": "4:2:0", "webp_method": 2},
+    "balanced": {"avif_speed": 6, "avif_subsampling": "4:2:0", "webp_method": 4},
+    "max": {"avif_speed": 4, "avif_subsampling": "4:4:4", "webp_method": 6},
+}
+PROFILE = "balanced"
+
+# Tiefenkarten: max. Kantenlänge und WebP-Qualität (der Parallax-Effekt
+# braucht kaum Details, die Karte wird im Shader ohnehin weich interpoliert)
+DEPTH_MAP_MAX_SIZE = 512
+DEPTH_MAP_QUALITY = 85
+
+# Inline-Platzhalter (LQIP) im HTML: max. Kantenlänge und WebP-Qualität
+LQIP_MAX_SIZE = 16
+LQIP_QUALITY = 40
 
-# Qualitätseinstellungen
-AVIF_QUALITY = 80
-JPG_QUALITY = 85
+# Verkleinern: ab diesem Faktor erst ganzzahlig per reduce(), dann LANCZOS
+REDUCING_GAP = 3.0
 
+# Manifest: Hash, Größe, mtime und Einstellungen je Original der letzten Konvertierung
+MANIFEST_FILE = IMAGES_DIR / ".variants.json"
+
+# --watch: Abfrage-Intervall und Ruhezeit nach der letzten Änderung, bevor
+# konvertiert wird (fängt z.B. das Kopieren eines ganzen Ordners ab)
+WATCH_INTERVAL = 1.0
+WATCH_DEBOUNCE = 2.0
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Einstellungen einer Konvertierung; Settings.current() liest die Konstanten oben."""
+    thumb_max_size: int
+    tiny_max_size: int
+    thumb_widths: tuple
+    avif_quality: int
+    webp_quality: int
+    jpg_quality: int
+    profile: str
+    reducing_gap: float
+    depth_map_max_size: int
+    depth_map_quality: int
+    lqip_max_size: int
+    lqip_quality: int
+    
+    @classmethod
+    def current(cls, **changes) -> 'Settings':
+        """Die Konstanten dieses Moduls, einzelne Werte überschrieben durch changes."""
+        return replace(cls(
+            thumb_max_size=THUMB_MAX_SIZE,
+            tiny_max_size=TINY_MAX_SIZE,
+            thumb_widths=tuple(THUMB_WIDTHS),
+            avif_quality=AVIF_QUALITY,
+            webp_quality=WEBP_QUALITY,
+            jpg_quality=JPG_QUALITY,
+            profile=PROFILE,
+            reducing_gap=REDUCING_GAP,
+            depth_map_max_size=DEPTH_MAP_MAX_SIZE,
+            depth_map_quality=DEPTH_MAP_QUALITY,
+            lqip_max_size=LQIP_MAX_SIZE,
+            lqip_quality=LQIP_QUALITY,
+        ), **changes)
+    
+    @property
+    def webp_method(self) -> int:
+        return ENCODER_PROFILES[self.profile]["webp_method"]
+    
+    def avif_options(self) -> dict:
+        """Parameter für img.save(..., 'AVIF')."""
+        profile = ENCODER_PROFILES[self.profile]
+        return {
+            "quality": self.avif_quality,
+            "speed": profile["avif_speed"],
+            "subsampling": profile["avif_subsampling"],
+        }
+    
+    def widths_for(self, original_width: int, original_height: int) -> list:
+        """srcset-Breiten, die für ein Original dieser Größe erzeugt werden."""
+        thumb_width = fit_size(original_width, original_height, self.thumb_max_size)[0]
+        return [w for w in self.thumb_widths if w < thumb_width]
+    
+    def image_record(self) -> dict:
+        """
+        Einstellungen, von denen die erzeugten Bilder abhängen (fürs Manifest).
+        
+        Das Standard-Profil sind die Encoder-Voreinstellungen, mit denen auch
+        die Einträge von vor --profile entstanden sind; es steht deshalb nicht
+        im Eintrag, damit diese gültig bleiben.
+        """
+        record = {
+            "avif_quality": self.avif_quality,
+            "jpg_quality": self.jpg_quality,
+            "thumb_max_size": self.thumb_max_size,
+            "tiny_max_size": self.tiny_max_size,
+            "thumb_widths": list(self.thumb_widths),
+            "webp_quality": self.webp_quality,
+        }
+        if self.profile != "balanced":
+            record["profile"] = dict(ENCODER_PROFILES[self.profile], name=self.profile)
+        return record
+    
+    def depth_map_record(self) -> dict:
+        """Einstellungen, von denen die erzeugten Tiefenkarten abhängen (fürs Manifest)."""
+        return {
+            "depth_map_max_size": self.depth_map_max_size,
+            "depth_map_quality": self.depth_map_quality,
+        }
+
+
+@dataclass(frozen=True)
+class OutputDirs:
+    """Ausgabe-Verzeichnisse und Manifest; OutputDirs.current() liest COMPRESSED_DIR usw."""
+    compressed: Path
+    thumbs: Path
+    tiny: Path
+    maps: Path
+    manifest: Path
+    
+    @classmethod
+    def current(cls) -> 'OutputDirs':
+        return cls(COMPRESSED_DIR, THUMBS_DIR, TINY_DIR, MAPS_DIR, MANIFEST_FILE)
+    
+    @classmethod
+    def under(cls, root: Path) -> 'OutputDirs':
+        """Dieselbe Aufteilung wie in images/, aber unter root."""
+        root = Path(root)
+        return cls(root / "compressed", root / "thumbs", root / "tiny", root / "maps",
+                   root / MANIFEST_FILE.name)
+    
+    def ensure(self):
+        for path in (self.compressed, self.thumbs, self.tiny, self.maps):
+            path.mkdir(parents=True, exist_ok=True)
+    
+    def path(self, base_name: str, variant: str) -> Path:
+        """
+        Datei einer Variante: der Teil vor '-' bzw. '.' ist das Verzeichnis,
+        der Rest wird an den Namen gehängt ("thumbs-400w.avif" -> thumbs/<name>-400w.avif).
+        """
+        kind, ext = variant.rsplit('.', 1)
+        folder, _, suffix = kind.partition('-')
+        return getattr(self, folder) / f"{base_name}{'-' + suffix if suffix else ''}.{ext}"
 
-def ensure_dirs():
+
+class Variant(NamedTuple):
+    """Eine kodierte Variante, z.B. Variant("thumbs.avif", b"...", 667, 1000)."""
+    name: str
+    data: bytes
+    width: int
+    height: int
+
+
+def ensure_dirs(dirs: OutputDirs = None):
     """Erstellt Ausgabe-Verzeichnisse falls nicht vorhanden."""
-    COMPRESSED_DIR.mkdir(exist_ok=True)
-    THUMBS_DIR.mkdir(exist_ok=True)
-    TINY_DIR.mkdir(exist_ok=True)
+    (dirs or OutputDirs.current()).ensure()
 
 
 def get_image_path(name: str) -> Path:
@@ -81,13 +259,154 @@ def get_image_path(name: str) -> Path:
     return path  # Gibt den erwarteten Pfad zurück (für Fehlermeldung)
 
 
-def convert_image(source_path: Path, force: bool = False) -> bool:
+def fit_size(width: int, height: int, max_size: int) -> tuple:
+    """Größe, die in max_size × max_size passt; Seitenverhältnis bleibt, kein Hochskalieren."""
+    if width <= max_size and height <= max_size:
+        return width, height
+    if width >= height:
+        return max_size, max(1, height * max_size // width)
+    return max(1, width * max_size // height), max_size
+
+
+def open_source(source):
+    """Öffnet ein Original aus Pfad, Bytes oder Datei-Objekt (z.B. sys.stdin.buffer)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return Image.open(source)
+
+
+def encode(img, name: str, settings: Settings) -> Variant:
+    """Kodiert img im Format der Variante name (Endung avif, webp oder jpg)."""
+    buffer = io.BytesIO()
+    ext = name.rsplit('.', 1)[1]
+    if ext == 'avif':
+        img.save(buffer, 'AVIF', **settings.avif_options())
+    elif ext == 'webp':
+        img.save(buffer, 'WEBP', quality=settings.webp_quality, method=settings.webp_method)
+    else:
+        img.save(buffer, 'JPEG', quality=settings.jpg_quality, optimize=True)
+    return Variant(name, buffer.getvalue(), *img.size)
+
+
+def encode_variants(source, settings: Settings = None, only=None):
+    """
+    Kodiert ein Original in alle Varianten, ohne etwas zu schreiben.
+    
+    Die Varianten entstehen erst beim Iterieren, so dass nie mehr als eine
+    kodierte Datei im Speicher liegt und ein Abbruch die übrigen spart.
+    
+    Args:
+        source: Pfad, Bytes oder Datei-Objekt des Original-Bildes
+        settings: Einstellungen (Standard: Settings.current())
+        only: Namen der gewünschten Varianten (Standard: alle); andere werden
+            weder skaliert noch kodiert
+        
+    Yields:
+        Variant(name, data, width, height) - compressed.avif, thumbs.jpg,
+        thumbs.avif, thumbs-<breite>w.avif/.webp/.jpg, tiny.jpg
+    """
+    settings = settings or Settings.current()
+    
+    def wanted(name):
+        return only is None or name in only
+    
+    def wanted_width(width):
+        return any(wanted(f'thumbs-{width}w.{ext}') for ext in ('avif', 'webp', 'jpg'))
+    
+    # Das Vollbild lebt nur bis die Thumbnail-Größen erzeugt sind
+    with open_source(source) as opened:
+        # In RGB konvertieren falls nötig (für JPEG-Ausgabe)
+        img = opened if opened.mode == 'RGB' else opened.convert('RGB')
+        original_width, original_height = img.size
+        
+        # 1. COMPRESSED (volle Größe, optimiert); nur AVIF, das Vollbild im
+        # Grid lädt compressed/<name>.avif und sonst das Thumbnail
+        if wanted('compressed.avif'):
+            yield encode(img, 'compressed.avif', settings)
+        
+        # 2. THUMBS (skaliert auf max 1000 × 1000 px); tiny wird daraus skaliert
+        thumb_width, thumb_height = fit_size(original_width, original_height, settings.thumb_max_size)
+        
+        thumb_img = None
+        if any(wanted(name) for name in ('thumbs.jpg', 'thumbs.avif', 'tiny.jpg')):
+            if (thumb_width, thumb_height) != (original_width, original_height):
+                thumb_img = img.resize((thumb_width, thumb_height), Image.LANCZOS,
+                                       reducing_gap=settings.reducing_gap)
+            else:
+                thumb_img = img.copy()
+        
+        # Breiten für srcset, ebenfalls aus dem Vollbild skaliert
+        ladder = []
+        for width in settings.widths_for(original_width, original_height):
+            if not wanted_width(width):
+                continue
+            height = max(1, round(original_height * width / original_width))
+            ladder.append(img.resize((width, height), Image.LANCZOS,
+                                     reducing_gap=settings.reducing_gap))
+        # Das Vollbild wird ab hier nicht mehr gebraucht
+        del img
+    
+    for name in ('thumbs.jpg', 'thumbs.avif'):
+        if wanted(name):
+            yield encode(thumb_img, name, settings)
+    
+    # srcset-Breiten in AVIF, WebP und JPG
+    while ladder:
+        ladder_img = ladder.pop(0)
+        for ext in ('avif', 'webp', 'jpg'):
+            name = f'thumbs-{ladder_img.width}w.{ext}'
+            if wanted(name):
+                yield encode(ladder_img, name, settings)
+        del ladder_img
+    
+    # 3. TINY / LQIP (sehr klein für Blur-Placeholder), aus dem Thumbnail skaliert;
+    # JPG (kein AVIF nötig für so kleine Bilder)
+    if wanted('tiny.jpg'):
+        tiny_size = fit_size(original_width, original_height, settings.tiny_max_size)
+        yield encode(thumb_img.resize(tiny_size, Image.LANCZOS), 'tiny.jpg', settings)
+
+
+def encode_depth_map(source, settings: Settings = None):
+    """
+    Verkleinert eine Tiefenkarte zu einem Graustufen-WebP.
+    
+    Yields:
+        Variant("maps.webp", data, width, height)
+    """
+    settings = settings or Settings.current()
+    with open_source(source) as img:
+        depth = img.convert('L')
+    depth.thumbnail((settings.depth_map_max_size, settings.depth_map_max_size), Image.LANCZOS,
+                    reducing_gap=settings.reducing_gap)
+    buffer = io.BytesIO()
+    depth.save(buffer, 'WEBP', quality=settings.depth_map_quality, method=settings.webp_method)
+    yield Variant('maps.webp', buffer.getvalue(), depth.width, depth.height)
+
+
+def encode_source(source, name: str, settings: Settings = None, only=None):
+    """encode_variants() oder, wenn name eine Tiefenkarte ist, encode_depth_map()."""
+    if is_depth_map(Path(name)):
+        return encode_depth_map(source, settings)
+    return encode_variants(source, settings, only)
+
+
+def write_variant(variant: Variant, base_name: str, dirs: OutputDirs = None) -> Path:
+    """Schreibt eine Variante an ihren Platz in dirs (Standard: OutputDirs.current())."""
+    path = (dirs or OutputDirs.current()).path(base_name, variant.name)
+    path.write_bytes(variant.data)
+    return path
+
+
+def convert_image(source_path: Path, force: bool = False,
+                  settings: Settings = None, dirs: OutputDirs = None) -> bool:
     """
     Konvertiert ein Bild in alle benötigten Varianten.
     
     Args:
         source_path: Pfad zum Original-Bild
         force: Wenn True, werden bestehende Dateien überschrieben
+        settings: Einstellungen (Standard: Settings.current())
+        dirs: Ausgabe-Verzeichnisse (Standard: OutputDirs.current())
         
     Returns:
         True wenn erfolgreich, False bei Fehler
@@ -99,81 +418,23 @@ def convert_image(source_path: Path, force: bool = False) -> bool:
     # Basis-Name ohne Extension
     base_name = source_path.stem
     
-    # Prüfen ob bereits konvertiert (wenn nicht force)
-    if not force:
-        existing = []
-        if (COMPRESSED_DIR / f"{base_name}.avif").exists():
-            existing.append("compressed/avif")
-        if (COMPRESSED_DIR / f"{base_name}.jpg").exists():
-            existing.append("compressed/jpg")
-        if (THUMBS_DIR / f"{base_name}.avif").exists():
-            existing.append("thumbs/avif")
-        if (THUMBS_DIR / f"{base_name}.jpg").exists():
-            existing.append("thumbs/jpg")
-        if (TINY_DIR / f"{base_name}.jpg").exists():
-            existing.append("tiny/jpg")
-        
-        if len(existing) == 5:
-            print(f"⏭️  {base_name}: Bereits vollständig konvertiert (--force zum Überschreiben)")
-            return True
+    # Prüfen ob Original und Einstellungen seit der letzten Konvertierung gleich sind
+    if not force and is_up_to_date(source_path, settings=settings, dirs=dirs):
+        print(f"⏭️  {base_name}: Unverändert seit der letzten Konvertierung (--force zum Überschreiben)")
+        return True
     
     print(f"🔄 Konvertiere: {base_name}")
+    reset_peak_memory()
     
     try:
-        # Bild öffnen
-        with Image.open(source_path) as img:
-            # In RGB konvertieren falls nötig (für JPEG-Ausgabe)
-            if img.mode in ('RGBA', 'P'):
-                img = img.convert('RGB')
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            original_width, original_height = img.size
-            print(f"   Original: {original_width} × {original_height} px")
-            
-            # 1. COMPRESSED (volle Größe, optimiert)
-            # JPG
-            compressed_jpg = COMPRESSED_DIR / f"{base_name}.jpg"
-            img.save(compressed_jpg, 'JPEG', quality=JPG_QUALITY, optimize=True)
-            print(f"   ✓ compressed/{base_name}.jpg ({compressed_jpg.stat().st_size // 1024} KB)")
-            
-            # AVIF
-            compressed_avif = COMPRESSED_DIR / f"{base_name}.avif"
-            img.save(compressed_avif, 'AVIF', quality=AVIF_QUALITY)
-            print(f"   ✓ compressed/{base_name}.avif ({compressed_avif.stat().st_size // 1024} KB)")
-            
-            # 2. THUMBS (skaliert auf max 1000px Höhe)
-            thumb_ratio = min(1.0, THUMB_MAX_HEIGHT / original_height)
-            thumb_width = int(original_width * thumb_ratio)
-            thumb_height = int(original_height * thumb_ratio)
-            
-            if thumb_ratio < 1.0:
-                thumb_img = img.resize((thumb_width, thumb_height), Image.LANCZOS)
-            else:
-                thumb_img = img.copy()
-            
-            # JPG
-            thumbs_jpg = THUMBS_DIR / f"{base_name}.jpg"
-            thumb_img.save(thumbs_jpg, 'JPEG', quality=JPG_QUALITY, optimize=True)
-            print(f"   ✓ thumbs/{base_name}.jpg ({thumb_width} × {thumb_height} px, {thumbs_jpg.stat().st_size // 1024} KB)")
-            
-            # AVIF
-            thumbs_avif = THUMBS_DIR / f"{base_name}.avif"
-            thumb_img.save(thumbs_avif, 'AVIF', quality=AVIF_QUALITY)
-            print(f"   ✓ thumbs/{base_name}.avif ({thumbs_avif.stat().st_size // 1024} KB)")
-            
-            # 3. TINY / LQIP (sehr klein für Blur-Placeholder)
-            tiny_ratio = TINY_MAX_HEIGHT / original_height
-            tiny_width = max(1, int(original_width * tiny_ratio))
-            tiny_height = max(1, int(original_height * tiny_ratio))
-            
-            tiny_img = img.resize((tiny_width, tiny_height), Image.LANCZOS)
-            
-            # JPG (kein AVIF nötig für so kleine Bilder)
-            tiny_jpg = TINY_DIR / f"{base_name}.jpg"
-            tiny_img.save(tiny_jpg, 'JPEG', quality=JPG_QUALITY, optimize=True)
-            print(f"   ✓ tiny/{base_name}.jpg ({tiny_width} × {tiny_height} px, {tiny_jpg.stat().st_size // 1024} KB)")
-            
+        for variant in encode_variants(source_path, settings):
+            if variant.name == 'compressed.avif':
+                print(f"   Original: {variant.width} × {variant.height} px")
+            path = write_variant(variant, base_name, dirs)
+            print(f"   ✓ {path.parent.name}/{path.name} ({variant.width} × {variant.height} px, "
+                  f"{len(variant.data) // 1024} KB)")
+        
+        print(f"   Speicher: {peak_memory_mb():.0f} MB Spitze")
         print(f"✅ {base_name}: Fertig!")
         return True
         
@@ -182,9 +443,355 @@ def convert_image(source_path: Path, force: bool = False) -> bool:
         return False
 
 
-def find_unconverted_images() -> list:
-    """Findet alle Bilder in images/ die noch nicht konvertiert wurden."""
+def reset_peak_memory():
+    """Setzt den Spitzenwert des Speicherverbrauchs zurück (nur Linux)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_memory_mb() -> float:
+    """
+    Spitzenwert des Speicherverbrauchs (RSS) seit reset_peak_memory().
+    
+    Ohne /proc (macOS) ist es der Spitzenwert des ganzen Prozesses.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS meldet Bytes, Linux Kilobytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def placeholder(img, settings: Settings = None) -> dict:
+    """
+    Kompakter Platzhalter zum Einbetten ins HTML: ein winziges WebP als
+    data-URI und die Durchschnittsfarbe des Bildes.
+    """
+    settings = settings or Settings.current()
+    small = img.convert('RGB')
+    small.thumbnail((settings.lqip_max_size, settings.lqip_max_size), Image.LANCZOS)
+    buffer = io.BytesIO()
+    small.save(buffer, 'WEBP', quality=settings.lqip_quality)
+    r, g, b = small.resize((1, 1), Image.BOX).getpixel((0, 0))
+    return {
+        "data_uri": "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode('ascii'),
+        "color": f"#{r:02x}{g:02x}{b:02x}",
+    }
+
+
+def tiny_placeholder(base_name: str, dirs: OutputDirs = None, settings: Settings = None):
+    """Platzhalter aus tiny/<name>.jpg, oder None wenn es die Datei nicht gibt."""
+    tiny = (dirs or OutputDirs.current()).path(base_name, 'tiny.jpg')
+    if not tiny.exists():
+        return None
+    with Image.open(tiny) as img:
+        return placeholder(img, settings)
+
+
+def source_widths(source_path: Path, settings: Settings = None) -> list:
+    """srcset-Breiten eines Originals; liest nur den Bild-Header."""
+    with Image.open(source_path) as img:
+        return (settings or Settings.current()).widths_for(*img.size)
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(dirs: OutputDirs = None) -> dict:
+    try:
+        with open((dirs or OutputDirs.current()).manifest, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: dict, dirs: OutputDirs = None):
+    with open((dirs or OutputDirs.current()).manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def source_record(source_path: Path, sha256: str = None,
+                  settings: Settings = None, dirs: OutputDirs = None) -> dict:
+    """Manifest-Eintrag für ein Original mit den aktuellen Einstellungen."""
+    settings = settings or Settings.current()
+    stat = source_path.stat()
+    if is_depth_map(source_path):
+        return {
+            "sha256": sha256 or file_hash(source_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "settings": settings.depth_map_record(),
+        }
+    record = {
+        "sha256": sha256 or file_hash(source_path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "settings": settings.image_record(),
+        "widths": source_widths(source_path, settings),
+    }
+    lqip = tiny_placeholder(source_path.stem, dirs, settings)
+    if lqip:
+        record["lqip"] = lqip
+    return record
+
+
+def manifest_key(source_path: Path) -> str:
+    """Schlüssel im Manifest: Dateiname, bei Tiefenkarten mit maps/ davor."""
+    if is_depth_map(source_path):
+        return f"maps/{source_path.name}"
+    return source_path.name
+
+
+def source_settings(source_path: Path, settings: Settings = None) -> dict:
+    settings = settings or Settings.current()
+    if is_depth_map(source_path):
+        return settings.depth_map_record()
+    return settings.image_record()
+
+
+def is_up_to_date(source_path: Path, manifest: dict = None,
+                  settings: Settings = None, dirs: OutputDirs = None) -> bool:
+    """
+    True wenn alle Varianten existieren und aus genau diesem Original mit den
+    aktuellen Einstellungen erzeugt wurden.
+    
+    Größe und mtime ersparen das Hashen; weichen sie ab (z.B. nach git
+    checkout), entscheidet der Hash.
+    """
+    if manifest is None:
+        manifest = load_manifest(dirs)
+    record = manifest.get(manifest_key(source_path))
+    if not record or record.get("settings") != source_settings(source_path, settings):
+        return False
+    if is_depth_map(source_path):
+        variants = [depth_map_variant(source_path, dirs)]
+    else:
+        variants = variant_paths(source_path.stem, record.get("widths", []), dirs)
+    if not all(p.exists() for p in variants):
+        return False
+    stat = source_path.stat()
+    if record["size"] == stat.st_size and record["mtime"] == stat.st_mtime:
+        return True
+    return record["size"] == stat.st_size and record["sha256"] == file_hash(source_path)
+
+
+def update_manifest(paths: list, settings: Settings = None, dirs: OutputDirs = None):
+    """Trägt die gerade konvertierten Originale ins Manifest ein."""
+    if not paths:
+        return
+    manifest = load_manifest(dirs)
+    for path in paths:
+        manifest[manifest_key(path)] = source_record(path, settings=settings, dirs=dirs)
+    save_manifest(manifest, dirs)
+
+
+def output_paths(source_path: Path, dirs: OutputDirs = None, settings: Settings = None) -> list:
+    """Alle Ausgabe-Dateien eines Originals oder einer Tiefenkarte."""
+    if is_depth_map(source_path):
+        return [depth_map_variant(source_path, dirs)]
+    return variant_paths(source_path.stem, source_widths(source_path, settings), dirs)
+
+
+def variant_names(widths: list = ()) -> list:
+    """Namen aller Varianten eines Bildes, in der Reihenfolge von encode_variants()."""
+    return (['compressed.avif', 'thumbs.jpg', 'thumbs.avif']
+            + [f'thumbs-{width}w.{ext}' for width in widths for ext in ('avif', 'webp', 'jpg')]
+            + ['tiny.jpg'])
+
+
+def variant_paths(base_name: str, widths: list = (), dirs: OutputDirs = None) -> list:
+    """Alle Ausgabe-Dateien eines Bildes (srcset-Breiten siehe source_widths)."""
+    dirs = dirs or OutputDirs.current()
+    return [dirs.path(base_name, name) for name in variant_names(widths)]
+
+
+def _init_worker():
+    """
+    Strg+C behandelt nur der Hauptprozess: laufende Bilder werden noch fertig
+    geschrieben, wartende verworfen.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _convert_captured(source_path: Path, force: bool, settings: Settings, dirs: OutputDirs):
+    """Konvertiert ein Bild und sammelt dessen Ausgabe statt sie zu drucken."""
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        success = convert_source(source_path, force=force, settings=settings, dirs=dirs)
+    return success, output.getvalue(), time.perf_counter() - start
+
+
+def worker_pool(jobs: int) -> ProcessPoolExecutor:
+    """Prozess-Pool für convert_all(); Strg+C bricht nur den Hauptprozess ab."""
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker)
+
+
+def convert_all(paths: list, force: bool = False, jobs: int = 1,
+                settings: Settings = None, dirs: OutputDirs = None,
+                pool: ProcessPoolExecutor = None) -> int:
+    """
+    Konvertiert mehrere Bilder, bei jobs > 1 in einem Prozess-Pool.
+    
+    Die Ausgabe erscheint pro Bild am Stück und in der Reihenfolge von paths,
+    die erzeugten Dateien sind dieselben wie bei serieller Konvertierung.
+    Ein übergebener pool (siehe worker_pool) wird benutzt und bleibt offen.
+    
+    Returns:
+        Anzahl der erfolgreich konvertierten Bilder
+    """
+    settings = settings or Settings.current()
+    dirs = dirs or OutputDirs.current()
+    start = time.perf_counter()
+    own_pool = pool is None and jobs > 1
+    if own_pool:
+        pool = worker_pool(jobs)
+    if pool:
+        count = len(paths)
+        results = pool.map(_convert_captured, paths, [force] * count, [settings] * count, [dirs] * count)
+    else:
+        results = (_convert_captured(path, force, settings, dirs) for path in paths)
+    
+    converted = []
+    busy = 0.0
+    try:
+        for path, (success_one, output, seconds) in zip(paths, results):
+            print(output, end='')
+            print(f"   ⏱  {seconds:.1f} s\n")
+            if success_one:
+                converted.append(path)
+            busy += seconds
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+        update_manifest(converted, settings, dirs)
+    success = len(converted)
+    
+    elapsed = time.perf_counter() - start
+    total_bytes = sum(p.stat().st_size for path in paths if path.exists()
+                      for p in output_paths(path, dirs, settings) if p.exists())
+    print(f"{'='*40}")
+    print(f"Fertig: {success}/{len(paths)} Bilder konvertiert")
+    print(f"Varianten: {total_bytes / 1024 / 1024:.1f} MB")
+    print(f"Zeit: {elapsed:.1f} s ({busy:.1f} s Summe pro Bild, {max(jobs, 1)} Prozesse)")
+    return success
+
+
+def is_depth_map(source_path: Path) -> bool:
+    return source_path.name.endswith('_map.png')
+
+
+def depth_map_variant(source_path: Path, dirs: OutputDirs = None) -> Path:
+    return (dirs or OutputDirs.current()).path(source_path.stem, 'maps.webp')
+
+
+def convert_depth_map(source_path: Path, force: bool = False,
+                      settings: Settings = None, dirs: OutputDirs = None) -> bool:
+    """
+    Verkleinert eine Tiefenkarte und speichert sie als Graustufen-WebP.
+    
+    Returns:
+        True wenn erfolgreich, False bei Fehler
+    """
+    if not source_path.exists():
+        print(f"❌ Datei nicht gefunden: {source_path}")
+        return False
+    
+    name = source_path.stem
+    if not force and is_up_to_date(source_path, settings=settings, dirs=dirs):
+        print(f"⏭️  {name}: Unverändert seit der letzten Konvertierung (--force zum Überschreiben)")
+        return True
+    
+    print(f"🔄 Tiefenkarte: {name}")
+    try:
+        with Image.open(source_path) as img:
+            original_size = source_path.stat().st_size
+            print(f"   Original: {img.width} × {img.height} px ({original_size // 1024} KB)")
+        
+        for variant in encode_depth_map(source_path, settings):
+            target = write_variant(variant, name, dirs)
+            saved = 1 - len(variant.data) / original_size
+            print(f"   ✓ maps/{target.name} ({variant.width} × {variant.height} px, "
+                  f"{len(variant.data) // 1024} KB, -{saved:.0%})")
+        print(f"✅ {name}: Fertig!")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Fehler bei {name}: {e}")
+        return False
+
+
+def convert_source(source_path: Path, force: bool = False,
+                   settings: Settings = None, dirs: OutputDirs = None) -> bool:
+    """Konvertiert ein Original-Bild oder eine Tiefenkarte."""
+    if is_depth_map(source_path):
+        return convert_depth_map(source_path, force=force, settings=settings, dirs=dirs)
+    return convert_image(source_path, force=force, settings=settings, dirs=dirs)
+
+
+def convert_stream(source, name: str, only: str = None,
+                   settings: Settings = None, dirs: OutputDirs = None) -> bool:
+    """
+    Konvertiert ein Original aus einem Datei-Objekt (z.B. stdin) ohne Manifest.
+    
+    Args:
+        source: Pfad, Bytes oder Datei-Objekt des Originals
+        name: Dateiname des Originals; bestimmt die Ausgabe-Namen und ob es
+            eine Tiefenkarte ist
+        only: Name einer Variante (z.B. "thumbs.avif"), die statt aller
+            Dateien nach stdout geschrieben wird
+        
+    Returns:
+        True wenn erfolgreich, False bei Fehler
+    """
+    base_name = Path(name).stem
+    try:
+        for variant in encode_source(source, name, settings, None if only is None else {only}):
+            if only is None:
+                path = write_variant(variant, base_name, dirs)
+                print(f"   ✓ {path.parent.name}/{path.name} ({variant.width} × {variant.height} px, "
+                      f"{len(variant.data) // 1024} KB)", file=sys.stderr)
+            elif variant.name == only:
+                sys.stdout.buffer.write(variant.data)
+                sys.stdout.buffer.flush()
+                return True
+    except Exception as e:
+        print(f"❌ Fehler bei {base_name}: {e}", file=sys.stderr)
+        return False
+    if only is not None:
+        print(f"❌ Variante {only} wird für {name} nicht erzeugt", file=sys.stderr)
+        return False
+    return True
+
+
+def find_unconverted_maps(settings: Settings = None) -> list:
+    """Findet alle Tiefenkarten die neu sind oder sich geändert haben."""
+    if not MAPS_DIR.is_dir():
+        return []
+    manifest = load_manifest()
+    return [path for path in MAPS_DIR.iterdir()
+            if path.is_file() and is_depth_map(path) and not is_up_to_date(path, manifest, settings)]
+
+
+def find_unconverted_images(settings: Settings = None) -> list:
+    """Findet alle Bilder in images/ die neu sind oder sich seit der letzten Konvertierung geändert haben."""
     unconverted = []
+    manifest = load_manifest()
     
     for path in IMAGES_DIR.iterdir():
         if not path.is_file():
@@ -192,23 +799,77 @@ def find_unconverted_images() -> list:
         if path.suffix.lower() not in ['.jpg', '.jpeg', '.png']:
             continue
         
-        base_name = path.stem
-        
-        # Prüfen ob alle Varianten existieren
-        has_all = (
-            (COMPRESSED_DIR / f"{base_name}.avif").exists() and
-            (COMPRESSED_DIR / f"{base_name}.jpg").exists() and
-            (THUMBS_DIR / f"{base_name}.avif").exists() and
-            (THUMBS_DIR / f"{base_name}.jpg").exists() and
-            (TINY_DIR / f"{base_name}.jpg").exists()
-        )
-        
-        if not has_all:
+        if not is_up_to_date(path, manifest, settings):
             unconverted.append(path)
     
     return unconverted
 
 
+def source_files() -> list:
+    """Alle Originale in images/ und Tiefenkarten in images/maps/."""
+    paths = [p for p in IMAGES_DIR.iterdir()
+             if p.is_file() and p.suffix.lower() in ['.jpg', '.jpeg', '.png']]
+    if MAPS_DIR.is_dir():
+        paths += [p for p in MAPS_DIR.iterdir() if p.is_file() and is_depth_map(p)]
+    return paths
+
+
+def snapshot() -> dict:
+    """{Pfad: (Größe, mtime)} aller Originale; liest nur Verzeichnis-Einträge."""
+    states = {}
+    for path in source_files():
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        states[path] = (stat.st_size, stat.st_mtime_ns)
+    return states
+
+
+def watch(jobs: int = 1, settings: Settings = None,
+          interval: float = WATCH_INTERVAL, debounce: float = WATCH_DEBOUNCE):
+    """
+    Beobachtet images/ und images/maps/ und konvertiert neue oder geänderte Originale.
+    
+    Beim Start wird nachgeholt, was seit der letzten Konvertierung fehlt.
+    Danach wird nur noch alle interval Sekunden per stat verglichen; geänderte
+    Dateien werden gesammelt und erst konvertiert, wenn debounce Sekunden lang
+    keine weitere Änderung kam. Der Prozess-Pool bleibt zwischen den Runden offen.
+    """
+    settings = settings or Settings.current()
+    pool = worker_pool(jobs) if jobs > 1 else None
+    try:
+        known = snapshot()
+        unconverted = find_unconverted_images(settings) + find_unconverted_maps(settings)
+        if unconverted:
+            print(f"\nKonvertiere {len(unconverted)} Bilder...\n")
+            convert_all(sorted(unconverted), jobs=jobs, settings=settings, pool=pool)
+        
+        print(f"👀 Beobachte {IMAGES_DIR.relative_to(REPO_ROOT)}/ (Strg+C zum Beenden)")
+        pending = {}
+        while True:
+            time.sleep(interval)
+            current = snapshot()
+            now = time.monotonic()
+            for path, state in current.items():
+                if known.get(path) != state:
+                    pending[path] = now
+            known = current
+            # Gelöschte Dateien vergessen
+            pending = {path: changed for path, changed in pending.items() if path in current}
+            
+            if pending and now - max(pending.values()) >= debounce:
+                changed, pending = sorted(pending), {}
+                print(f"\nKonvertiere {len(changed)} Bilder...\n")
+                convert_all(changed, jobs=jobs, settings=settings, pool=pool)
+                print(f"👀 Beobachte {IMAGES_DIR.relative_to(REPO_ROOT)}/ (Strg+C zum Beenden)")
+    except KeyboardInterrupt:
+        print("\nBeendet.")
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Konvertiert Bilder für susanneuhl.github.io",
@@ -219,46 +880,72 @@ Beispiele:
     python scripts/convert_image.py images/neues-projekt.jpg
     python scripts/convert_image.py --all
     python scripts/convert_image.py --all --force
+    python scripts/convert_image.py --all --force --jobs 0
+    python scripts/convert_image.py --all --force --profile max
+    python scripts/convert_image.py --watch --jobs 0
+    cat neu.jpg | python scripts/convert_image.py - --name neu.jpg
+    cat neu.jpg | python scripts/convert_image.py - --stdout thumbs-800w.webp > neu-800w.webp
         """
     )
-    parser.add_argument('image', nargs='?', help='Bildname oder Pfad zum Bild')
-    parser.add_argument('--all', action='store_true', help='Alle nicht-konvertierten Bilder verarbeiten')
+    parser.add_argument('image', nargs='?', help='Bildname oder Pfad zum Bild, - für stdin')
+    parser.add_argument('--all', action='store_true', help='Alle neuen oder geänderten Bilder verarbeiten')
     parser.add_argument('--force', action='store_true', help='Bestehende Dateien überschreiben')
     parser.add_argument('--list', action='store_true', help='Nicht-konvertierte Bilder auflisten')
+    parser.add_argument('--watch', action='store_true',
+                        help='images/ beobachten und neue oder geänderte Bilder sofort konvertieren')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Anzahl paralleler Prozesse für --all und --watch (0 = alle Kerne)')
+    parser.add_argument('--profile', choices=sorted(ENCODER_PROFILES), default=PROFILE,
+                        help='Encoder-Profil: fast, balanced (Standard) oder max')
+    parser.add_argument('--name', help='Dateiname des Bildes von stdin (bestimmt die Ausgabe-Namen)')
+    parser.add_argument('--stdout', metavar='VARIANTE',
+                        help='Nur diese Variante nach stdout schreiben, z.B. thumbs.avif oder thumbs-800w.webp')
     
     args = parser.parse_args()
+    settings = Settings.current(profile=args.profile)
+    
+    if args.image == '-' or args.stdout:
+        if args.image == '-' and not (args.name or args.stdout):
+            parser.error("Bild von stdin braucht --name oder --stdout")
+        if args.image == '-':
+            source, name = sys.stdin.buffer, args.name or 'stdin'
+        else:
+            source = get_image_path(args.image)
+            name = args.name or source.name
+        if not args.stdout:
+            ensure_dirs()
+        success = convert_stream(source, name, args.stdout, settings)
+        sys.exit(0 if success else 1)
     
     # Verzeichnisse erstellen
     ensure_dirs()
     
     if args.list:
-        unconverted = find_unconverted_images()
+        unconverted = find_unconverted_images(settings) + find_unconverted_maps(settings)
         if unconverted:
-            print(f"Nicht konvertierte Bilder ({len(unconverted)}):")
+            print(f"Neue oder geänderte Bilder ({len(unconverted)}):")
             for path in unconverted:
-                print(f"  - {path.name}")
+                print(f"  - {path.relative_to(IMAGES_DIR)}")
         else:
             print("Alle Bilder sind bereits konvertiert.")
         return
     
+    if args.watch:
+        watch(jobs=args.jobs or os.cpu_count() or 1, settings=settings)
+        return
+    
     if args.all:
-        unconverted = find_unconverted_images()
+        unconverted = find_unconverted_images(settings) + find_unconverted_maps(settings)
         if not unconverted:
             print("Alle Bilder sind bereits konvertiert.")
             if args.force:
                 print("Mit --force werden alle Bilder neu konvertiert...")
-                unconverted = [p for p in IMAGES_DIR.iterdir() 
-                              if p.is_file() and p.suffix.lower() in ['.jpg', '.jpeg', '.png']]
+                unconverted = source_files()
         
         if unconverted:
+            jobs = args.jobs or os.cpu_count() or 1
             print(f"\nKonvertiere {len(unconverted)} Bilder...\n")
-            success = 0
-            for path in sorted(unconverted):
-                if convert_image(path, force=args.force):
-                    success += 1
-                print()
-            print(f"\n{'='*40}")
-            print(f"Fertig: {success}/{len(unconverted)} Bilder konvertiert")
+            convert_all(sorted(unconverted), force=args.force, jobs=jobs, settings=settings)
         return
     
     if not args.image:
@@ -267,7 +954,9 @@ Beispiele:
         sys.exit(1)
     
     source_path = get_image_path(args.image)
-    success = convert_image(source_path, force=args.force)
+    success = convert_source(source_path, force=args.force, settings=settings)
+    if success:
+        update_manifest([source_path], settings)
     sys.exit(0 if success else 1)
 
 
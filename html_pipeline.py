@@ -0,0 +1,834 @@
+"""
+Applies the HTML build passes to the site's pages in one go.
+
+Each page is tokenized once with the standard library's HTML parser into a
+tree that keeps the exact source text of every token. The passes edit that
+shared tree (attributes are spliced into the original tag text, so nothing
+else in the file moves) and the page is written back once. A page that no
+pass changes is reproduced byte for byte. Every pass sets values derived
+from the page alone, so running the pipeline on its own output changes
+nothing; process_page() checks this on every run.
+
+Passes, in the order they run:
+    srcset      grid thumbs with generated widths get a width ladder and
+                GRID_SIZES on their <source>s and <img>
+    priority    images on the first screen (per LAYOUTS viewport model) load
+                eagerly, the LCP image is preloaded; the rest load lazily
+    lqip        inline --lqip/--lqip-color placeholders on every grid <li>
+    dimensions  width/height of the image file on every local <img>, so the
+                browser reserves the box (and its aspect-ratio) before loading
+    scripts     every onclick handler and the .reveal animation have their
+                JavaScript in the page (reports problems, changes nothing)
+
+Usage:
+    python html_pipeline.py                      # all pages, all passes
+    python html_pipeline.py index.html --pass lqip
+    python html_pipeline.py index.html --pass srcset --check    # srcset savings, no writes
+    python html_pipeline.py --check              # CI: fail if a page would change
+"""
+
+import argparse
+import difflib
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import struct
+import sys
+from html.parser import HTMLParser
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(REPO_ROOT, 'images')
+# convert_image needs Pillow, so the passes import it only when a page has
+# grid items; pages without them (shows.html in the scrape workflow) render
+# with the standard library alone
+sys.path.insert(0, os.path.join(REPO_ROOT, 'Image Conversion'))
+
+# Elements without an end tag
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'param', 'source', 'track', 'wbr'}
+
+TAG_NAME_RE = re.compile(r'<[^\s/>]+')
+ATTR_RE = re.compile(r'''(\s+)([^\s/>"'=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'=<>`]+))?''')
+
+
+class Text:
+    """Anything that is not an element: text, comments, doctype, entities"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.parent = None
+
+    def serialize(self):
+        return self.raw
+
+
+class Element:
+    """An element with its start tag exactly as written in the source"""
+
+    def __init__(self, tag, start='', end=''):
+        self.tag = tag
+        self.start = start
+        self.end = end
+        self.children = []
+        self.parent = None
+
+    def serialize(self):
+        return self.start + ''.join(child.serialize() for child in self.children) + self.end
+
+    def append(self, node):
+        node.parent = self
+        self.children.append(node)
+
+    def insert_before(self, child, node):
+        """Insert node before child, on its own line with the same indentation"""
+        index = self.children.index(child)
+        previous = self.children[index - 1] if index else None
+        indent = ''
+        if isinstance(previous, Text) and '\n' in previous.raw:
+            indent = previous.raw[previous.raw.rindex('\n'):]
+        node.parent = self
+        self.children[index:index] = [node, Text(indent)] if indent else [node]
+
+    def remove_child(self, child):
+        """Remove child together with the line break and indentation before it"""
+        index = self.children.index(child)
+        previous = self.children[index - 1] if index else None
+        if isinstance(previous, Text) and '\n' in previous.raw:
+            tail = previous.raw[previous.raw.rindex('\n'):]
+            if not tail.strip():
+                previous.raw = previous.raw[:-len(tail)]
+        del self.children[index]
+        child.parent = None
+
+    def iter(self, tag=None):
+        """All descendant elements in document order, optionally only one tag"""
+        for child in self.children:
+            if isinstance(child, Element):
+                if tag is None or child.tag == tag:
+                    yield child
+                yield from child.iter(tag)
+
+    def find(self, tag, cls=None):
+        """The first descendant with this tag (and class), or None"""
+        for element in self.iter(tag):
+            if cls is None or element.has_class(cls):
+                return element
+        return None
+
+    def text(self):
+        return ''.join(child.raw if isinstance(child, Text) else child.text()
+                       for child in self.children)
+
+    # Attributes are read from and written to the start tag text directly
+
+    def _attrs(self):
+        """[(name, value, start, end)] of the start tag, value None for bare attributes"""
+        attrs = []
+        match = TAG_NAME_RE.match(self.start)
+        pos = match.end() if match else 0
+        while True:
+            match = ATTR_RE.match(self.start, pos)
+            if not match:
+                return attrs
+            value = match.group(3)
+            if value and value[0] in '"\'':
+                value = value[1:-1]
+            attrs.append((match.group(2).lower(), value, match.start(), match.end()))
+            pos = match.end()
+
+    def get(self, name, default=None):
+        for attr, value, _, _ in self._attrs():
+            if attr == name:
+                return html.unescape(value) if value is not None else ''
+        return default
+
+    def has(self, name):
+        return any(attr == name for attr, _, _, _ in self._attrs())
+
+    def set(self, name, value):
+        """Set or replace an attribute; a new one is added at the end of the tag"""
+        if self.get(name) == value:
+            return
+        markup = f' {name}="{escape(value)}"'
+        for attr, _, start, end in self._attrs():
+            if attr == name:
+                self.start = self.start[:start] + markup + self.start[end:]
+                return
+        close = len(self.start.rstrip('>').rstrip('/').rstrip())
+        self.start = self.start[:close] + markup + self.start[close:]
+
+    def remove(self, name):
+        for attr, _, start, end in self._attrs():
+            if attr == name:
+                self.start = self.start[:start] + self.start[end:]
+                return
+
+    def classes(self):
+        return self.get('class', '').split()
+
+    def has_class(self, cls):
+        return cls in self.classes()
+
+    def add_class(self, cls):
+        if not self.has_class(cls):
+            self.set('class', ' '.join(self.classes() + [cls]))
+
+    def remove_class(self, cls):
+        if self.has_class(cls):
+            rest = [c for c in self.classes() if c != cls]
+            if rest:
+                self.set('class', ' '.join(rest))
+            else:
+                self.remove('class')
+
+
+def escape(value):
+    return value.replace('&', '&amp;').replace('"', '&quot;')
+
+
+class TreeBuilder(HTMLParser):
+    """Records every token with its offset so the tree can keep the source text"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.tokens = []
+
+    def _token(self, kind, tag=None):
+        self.tokens.append((kind, tag, self.getpos()))
+
+    def handle_starttag(self, tag, attrs):
+        self._token('start', tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._token('void', tag)
+
+    def handle_endtag(self, tag):
+        self._token('end', tag)
+
+    def handle_data(self, data):
+        self._token('text')
+
+    handle_entityref = handle_charref = handle_comment = handle_data
+    handle_decl = handle_pi = unknown_decl = handle_data
+
+
+def parse(source):
+    """Parse a page into a root Element whose serialize() returns source"""
+    builder = TreeBuilder()
+    builder.feed(source)
+    builder.close()
+
+    line_starts = [0]
+    for line in source.split('\n')[:-1]:
+        line_starts.append(line_starts[-1] + len(line) + 1)
+    offsets = [line_starts[line - 1] + col for _, _, (line, col) in builder.tokens]
+    offsets.append(len(source))
+
+    root = Element(None)
+    if builder.tokens and offsets[0] > 0:
+        root.append(Text(source[:offsets[0]]))
+    stack = [root]
+    for (kind, tag, _), begin, end in zip(builder.tokens, offsets, offsets[1:]):
+        raw = source[begin:end]
+        if kind in ('start', 'void'):
+            element = Element(tag, raw)
+            stack[-1].append(element)
+            if kind == 'start' and tag not in VOID_ELEMENTS:
+                stack.append(element)
+        elif kind == 'end' and tag in (e.tag for e in stack[1:]):
+            # Elements left open inside (e.g. an unclosed <p>) end here as well
+            while stack[-1].tag != tag:
+                stack.pop()
+            stack.pop().end = raw
+        else:
+            stack[-1].append(Text(raw))
+    if not builder.tokens:
+        root.append(Text(source))
+    return root
+
+
+class PassLog:
+    """What a pass did (notes) and what it found wrong (problems)"""
+
+    def __init__(self):
+        self.notes = []
+        self.problems = []
+
+    def note(self, message):
+        self.notes.append(message)
+
+    def problem(self, message):
+        self.problems.append(message)
+
+
+PASSES = {}
+
+
+def html_pass(name):
+    """Register a pass: a function (doc, page, log) that edits the tree in place"""
+    def register(func):
+        PASSES[name] = func
+        return func
+    return register
+
+
+def grid_items(doc):
+    """The <li>s of every project grid"""
+    for ul in doc.iter('ul'):
+        if ul.has_class('projects-list'):
+            yield from (child for child in ul.children
+                        if isinstance(child, Element) and child.tag == 'li')
+
+
+# --- srcset ------------------------------------------------------------------
+
+# Slot width of a grid image, mirroring the columns in styles.css
+# (1 column up to 768px, 2 up to 1024px, 3 above; container max 1500/1800px)
+GRID_SIZES = ("(max-width: 768px) calc(100vw - 40px), "
+              "(max-width: 1024px) calc(50vw - 30px), "
+              "(max-width: 1500px) calc(33.3vw - 27px), "
+              "(max-width: 1699px) 473px, 568px")
+
+# Viewports for the savings note, which compares the ladder pick with the
+# single thumb the <source> would load otherwise: (name, CSS width, device
+# pixel ratio)
+SRCSET_VIEWPORTS = [("mobile", 375, 2), ("desktop", 1440, 1)]
+
+
+def slot_width(viewport_width):
+    """CSS width of a grid image at the given viewport width (see GRID_SIZES)"""
+    if viewport_width <= 768:
+        return viewport_width - 40
+    if viewport_width <= 1024:
+        return viewport_width / 2 - 30
+    if viewport_width <= 1500:
+        return viewport_width / 3 - 27
+    return 473 if viewport_width < 1700 else 568
+
+
+def srcset(candidates):
+    """srcset value of [(width, url)]"""
+    return ", ".join(f"{url} {width}w" for width, url in candidates)
+
+
+def width_ladder(path, url, ext, thumb_width):
+    """
+    [(width, (url, path))] of the generated widths of a thumb (<name>-<w>w.<ext>
+    next to it, see "Image Conversion/convert_image.py") plus the thumb itself
+    if it exists in this format, smallest first.
+    """
+    from convert_image import THUMB_WIDTHS
+
+    stem, url_stem = os.path.splitext(path)[0], os.path.splitext(url)[0]
+    found = [(width, (f"{url_stem}-{width}w.{ext}", f"{stem}-{width}w.{ext}"))
+             for width in THUMB_WIDTHS if os.path.isfile(f"{stem}-{width}w.{ext}")]
+    if os.path.isfile(f"{stem}.{ext}"):
+        found.append((thumb_width, (f"{url_stem}.{ext}", f"{stem}.{ext}")))
+    return sorted(set(found))
+
+
+def set_source(picture, img, ext, candidates):
+    """Give the <source> of this type the ladder, adding one before img if there is none"""
+    mime = f"image/{ext}"
+    source = next((s for s in picture.iter('source') if s.get('type') == mime), None)
+    if source is None:
+        source = Element('source', '<source>')
+        picture.insert_before(img, source)
+    source.set('srcset', srcset(candidates))
+    source.set('sizes', GRID_SIZES)
+    source.set('type', mime)
+
+
+@html_pass('srcset')
+def srcset_pass(doc, page, log):
+    """
+    Grid thumbs with generated widths get a width ladder with GRID_SIZES on
+    their AVIF and WebP <source>s and on the <img>, so phones and 1x screens
+    fetch a narrower file; the priority pass then gives the preload the same
+    imagesrcset. Items without generated widths are left as they are.
+    """
+    thumbs = []
+    for item in grid_items(doc):
+        img = item.find('img')
+        path = local_image(page, img.get('src')) if img is not None else None
+        if path and img.parent is not None and img.parent.tag == 'picture':
+            thumbs.append((img, path))
+    sizes = image_sizes(sorted({path for _, path in thumbs}))
+
+    items, saved = 0, {viewport: [0, 0] for viewport, _, _ in SRCSET_VIEWPORTS}
+    for img, path in thumbs:
+        url, thumb_width = img.get('src'), sizes[path][0]
+        avif, webp, jpg = (width_ladder(path, url, ext, thumb_width) for ext in ('avif', 'webp', 'jpg'))
+        if len(avif) < 2 or not webp or len(jpg) < 2:
+            continue
+
+        for ext, ladder in (('avif', avif), ('webp', webp)):
+            set_source(img.parent, img, ext, [(width, url) for width, (url, _) in ladder])
+        img.set('srcset', srcset([(width, url) for width, (url, _) in jpg]))
+        img.set('sizes', GRID_SIZES)
+        items += 1
+
+        thumb_avif = os.path.splitext(path)[0] + '.avif'
+        if not os.path.isfile(thumb_avif):
+            continue
+        for viewport, width, dpr in SRCSET_VIEWPORTS:
+            # The browser takes the smallest candidate that is wide enough
+            needed = slot_width(width) * dpr
+            picked = next((file for w, (_, file) in avif if w >= needed), avif[-1][1][1])
+            saved[viewport][0] += os.path.getsize(thumb_avif)
+            saved[viewport][1] += os.path.getsize(picked)
+    if items:
+        log.note(f"{items} pictures with srcset; AVIF per page load, thumbs only -> srcset: " + ", ".join(
+            f"{viewport} {before / 1024:.0f} -> {after / 1024:.0f} KB"
+            for viewport, (before, after) in saved.items()))
+
+
+# --- priority ----------------------------------------------------------------
+
+# Where each page's images sit in the first screen. items is the container
+# whose element children are laid out row-major (the masonry script deals
+# them out as columns[i % cols]); each viewport is (columns, rows) visible
+# without scrolling. Portrait thumbs are ~600px tall in the 3-column desktop
+# grid at 1440x900, so the second row starts below the fold; on a phone the
+# second image peeks in under the first.
+LAYOUTS = {
+    'index.html': {'items': ('ul', 'projects-list'), 'reveal': True,
+                   'viewports': {'mobile': (1, 2), 'desktop': (3, 1)}},
+    'shows.html': {'items': ('div', 'events-list'),
+                   'viewports': {'mobile': (1, 1), 'desktop': (1, 2)}},
+    'about.html': {'items': ('main', None),
+                   'viewports': {'mobile': (1, 1), 'desktop': (1, 1)}},
+    'about-en.html': {'items': ('main', None),
+                      'viewports': {'mobile': (1, 1), 'desktop': (1, 1)}},
+}
+
+
+def layout_items(doc, layout):
+    """The element children of the page's item containers, in document order"""
+    tag, cls = layout['items']
+    for container in doc.iter(tag):
+        if cls is None or container.has_class(cls):
+            yield from (child for child in container.children if isinstance(child, Element))
+
+
+def image_preloads(doc):
+    """<link rel="preload" as="image"> elements in <head>"""
+    head = doc.find('head')
+    if head is None:
+        return []
+    return [link for link in head.iter('link')
+            if link.get('rel') == 'preload' and link.get('as') == 'image']
+
+
+def preload_attrs(img):
+    """Attributes of a preload link fetching what the browser picks for img"""
+    picture = img.parent if img.parent is not None and img.parent.tag == 'picture' else None
+    source = picture.find('source') if picture is not None else None
+    element = source if source is not None and source.get('srcset') else img
+    srcset = element.get('srcset') or ''
+    urls = [candidate.split()[0] for candidate in srcset.split(',') if candidate.strip()]
+    # Without a width ladder the href alone fetches the same file
+    attrs = {'href': urls[-1] if urls else img.get('src')}
+    if len(urls) > 1:
+        attrs['imagesrcset'] = srcset
+        attrs['imagesizes'] = element.get('sizes') or img.get('sizes') or '100vw'
+    if element.get('type'):
+        attrs['type'] = element.get('type')
+    attrs['fetchpriority'] = 'high'
+    return attrs
+
+
+def set_preload(doc, img, log):
+    """Make the LCP image the only image preload in <head>"""
+    links = image_preloads(doc)
+    attrs = preload_attrs(img)
+    if links:
+        link = links[0]
+        for attr in ('imagesrcset', 'imagesizes', 'type'):
+            if attr not in attrs:
+                link.remove(attr)
+    else:
+        head = doc.find('head')
+        anchor = next((link for link in head.iter('link') if link.get('rel') == 'stylesheet'), None)
+        link = Element('link', '<link rel="preload" as="image">')
+        if anchor is None:
+            head.append(link)
+        else:
+            anchor.parent.insert_before(anchor, link)
+        log.note(f"preload {attrs['href']} added")
+    for name, value in attrs.items():
+        link.set(name, value)
+    for extra in links[1:]:
+        extra.parent.remove_child(extra)
+    if links[1:]:
+        log.note(f"{len(links) - 1} preloads of non-LCP images removed")
+
+
+@html_pass('priority')
+def priority_pass(doc, page, log):
+    """
+    Images on the first screen of any viewport in LAYOUTS load eagerly. The
+    first of them is the LCP image: it alone gets fetchpriority high,
+    decodes synchronously and is the page's only image preload, so on a
+    one-column phone it does not share the bandwidth with images further
+    down. Everything below the fold loads lazily with low priority (and, on
+    pages that use it, fades in with .reveal). Every edit sets a value
+    computed from the item's position alone, so a second run changes nothing.
+    """
+    layout = LAYOUTS.get(os.path.basename(page))
+    if layout is None:
+        return
+    # Items are laid out row-major, so each viewport shows the first columns * rows
+    above = set()
+    for columns, rows in layout['viewports'].values():
+        above.update(range(columns * rows))
+
+    lcp = None
+    eager = lazy = 0
+    for index, item in enumerate(layout_items(doc, layout)):
+        above_fold = index in above
+        if layout.get('reveal'):
+            # Revealing fades in from opacity 0, which would delay the LCP image
+            if above_fold:
+                item.remove_class('reveal')
+            else:
+                item.add_class('reveal')
+        for img in item.iter('img'):
+            if lcp is None:
+                lcp = img
+            if img is lcp:
+                priority = 'high'
+            else:
+                priority = 'auto' if above_fold else 'low'
+            img.set('fetchpriority', priority)
+            img.set('decoding', 'sync' if img is lcp else 'async')
+            img.set('loading', 'eager' if above_fold else 'lazy')
+            if above_fold:
+                eager += 1
+            else:
+                lazy += 1
+    if lcp is not None:
+        set_preload(doc, lcp, log)
+    else:
+        # e.g. shows.html when no card has an image
+        for link in image_preloads(doc):
+            link.parent.remove_child(link)
+            log.note(f"preload {link.get('href')} removed (no image on the page)")
+    if eager or lazy:
+        log.note(f"{eager} eager, {lazy} lazy, LCP {lcp.get('src')}")
+
+
+# --- lqip --------------------------------------------------------------------
+
+THUMB_RE = re.compile(r'images/thumbs/(?P<name>[^"/\s,]+?)\.(?:avif|jpg)\b')
+LQIP_DECL_RE = re.compile(r"\s*--lqip(?:-color)?:\s*(?:url\('[^']*'\)|[^;\"]*)\s*;?")
+TINY_URL_RE = re.compile(r"url\('images/tiny/[^']*'\)")
+
+
+def placeholders():
+    """{name: placeholder} from the manifest, keyed by the image's base name"""
+    from convert_image import load_manifest
+
+    return {os.path.splitext(source)[0]: record['lqip']
+            for source, record in load_manifest().items() if 'lqip' in record}
+
+
+def set_lqip(element, declarations):
+    """Replace the --lqip declarations in an element's style attribute"""
+    rest = LQIP_DECL_RE.sub('', element.get('style', '')).strip()
+    style = '; '.join(d for d in (declarations, rest) if d)
+    if style:
+        element.set('style', style)
+    else:
+        element.remove('style')
+
+
+def item_thumb(item):
+    """Base name of the thumb shown by a grid item, or None"""
+    # The <img> src first: a srcset starts with a generated width (<name>-400w)
+    for element in list(item.iter('img')) + list(item.iter('source')):
+        match = THUMB_RE.search(element.get('src') or element.get('srcset') or '')
+        if match:
+            return match.group('name')
+    return None
+
+
+@html_pass('lqip')
+def lqip_pass(doc, page, log):
+    """
+    Each grid <li> gets --lqip (a tiny WebP data URI) and --lqip-color (the
+    average colour) in its style, so the blurred placeholder renders without
+    requesting images/tiny/<name>.jpg. The placeholders come from the image
+    manifest and are computed from images/tiny/ for images not in it yet.
+    """
+    known = None
+    items = requests = tiny_bytes = 0
+    for item in grid_items(doc):
+        name = item_thumb(item)
+        if not name:
+            continue
+        if known is None:
+            from convert_image import TINY_DIR, tiny_placeholder
+            known = placeholders()
+        lqip = known.get(name) or tiny_placeholder(name)
+        if not lqip:
+            log.problem(f"no placeholder for {name} (convert the image first)")
+            continue
+
+        for element in [item] + list(item.iter('picture')):
+            removed = len(TINY_URL_RE.findall(element.get('style', '')))
+            if removed:
+                requests += removed
+                tiny = TINY_DIR / f"{name}.jpg"
+                tiny_bytes += tiny.stat().st_size if tiny.exists() else 0
+        # The placeholder lives on the <li> so .image-wrapper::before inherits it
+        for picture in item.iter('picture'):
+            set_lqip(picture, '')
+        set_lqip(item, f"--lqip: url('{lqip['data_uri']}'); --lqip-color: {lqip['color']}")
+        items += 1
+    if items:
+        note = f"{items} inline placeholders"
+        if requests:
+            note += f", {requests} images/tiny requests ({tiny_bytes / 1024:.1f} KB) removed"
+        log.note(note)
+
+
+# --- dimensions --------------------------------------------------------------
+
+# Image sizes by path, with size/mtime/sha256 so unchanged files are not read
+SIZE_CACHE_FILE = os.path.join(IMAGES_DIR, '.dimensions.json')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# JPEG start-of-frame markers (C4, C8 and CC in between are not frames)
+SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+_size_cache = None
+_size_cache_changed = False
+
+
+def header_size(path):
+    """
+    (width, height) from the header of a PNG or JPEG; other formats are
+    opened with Pillow (which does not decode the pixels either).
+    """
+    with open(path, 'rb') as f:
+        head = f.read(24)
+        if head.startswith(PNG_SIGNATURE) and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head.startswith(b'\xff\xd8'):
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    break
+                if marker[1] == 0xFF:
+                    # Fill byte before a marker
+                    f.seek(-1, 1)
+                    continue
+                if marker[1] == 0x01 or 0xD0 <= marker[1] <= 0xD7:
+                    continue
+                length = struct.unpack('>H', f.read(2))[0]
+                if marker[1] in SOF_MARKERS:
+                    height, width = struct.unpack('>xHH', f.read(5))
+                    return width, height
+                f.seek(length - 2, 1)
+    from convert_image import Image
+
+    with Image.open(path) as img:
+        return img.size
+
+
+def image_sizes(paths):
+    """
+    {path: (width, height)} of image files, read in one batch.
+
+    Files whose size and mtime match SIZE_CACHE_FILE are not opened; a
+    changed mtime with the same content (e.g. after a checkout) costs one
+    hash, and only new content has its header read (header_size()). New records stay in memory until save_image_sizes().
+    """
+    global _size_cache, _size_cache_changed
+    if _size_cache is None:
+        try:
+            with open(SIZE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                _size_cache = json.load(f)
+        except (OSError, ValueError):
+            _size_cache = {}
+    by_hash = {record['sha256']: record for record in _size_cache.values()}
+
+    sizes = {}
+    for path in paths:
+        key = os.path.relpath(path, IMAGES_DIR).replace(os.sep, '/')
+        stat = os.stat(path)
+        record = _size_cache.get(key)
+        if not record or record['size'] != stat.st_size or record['mtime'] != stat.st_mtime:
+            with open(path, 'rb') as f:
+                sha256 = hashlib.file_digest(f, 'sha256').hexdigest()
+            known = by_hash.get(sha256)
+            if known:
+                width, height = known['width'], known['height']
+            else:
+                width, height = header_size(path)
+            record = {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': sha256,
+                      'width': width, 'height': height}
+            _size_cache[key] = by_hash[sha256] = record
+            _size_cache_changed = True
+        sizes[path] = (record['width'], record['height'])
+    return sizes
+
+
+def save_image_sizes():
+    """Write the sizes read by image_sizes() to SIZE_CACHE_FILE (not under --check)"""
+    global _size_cache_changed
+    if _size_cache_changed:
+        with open(SIZE_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(_size_cache, f, indent=1, sort_keys=True)
+        _size_cache_changed = False
+
+
+def local_image(page, src):
+    """Path of a site-relative image URL, or None for remote, empty or missing files"""
+    if not src or re.match(r'^(?:[a-z]+:|//)', src, re.I):
+        return None
+    path = os.path.join(os.path.dirname(os.path.abspath(page)), src.split('?')[0].split('#')[0])
+    return path if os.path.isfile(path) else None
+
+
+@html_pass('dimensions')
+def dimensions_pass(doc, page, log):
+    """
+    Every <img> showing a local file gets its width and height, which the
+    browser turns into an aspect-ratio for the box, so nothing moves when
+    the image or its placeholder arrives. The CSS must keep height: auto
+    for such images. Attributes that no longer match the file are updated.
+    """
+    images = [(img, local_image(page, img.get('src'))) for img in doc.iter('img')]
+    images = [(img, path) for img, path in images if path]
+    sizes = image_sizes(sorted({path for _, path in images}))
+    added = 0
+    for img, path in images:
+        width, height = (str(value) for value in sizes[path])
+        if img.get('width') != width or img.get('height') != height:
+            added += 1
+        img.set('width', width)
+        img.set('height', height)
+    if images:
+        note = f"{len(images)} images with width/height"
+        if added:
+            note += f", {added} updated"
+        log.note(note)
+
+
+# --- scripts -----------------------------------------------------------------
+
+HANDLER_CALL_RE = re.compile(r'(?<![\w.$])([A-Za-z_$][\w$]*)\s*\(')
+JS_BUILTINS = {'if', 'for', 'while', 'switch', 'return', 'function', 'typeof',
+               'alert', 'confirm', 'setTimeout', 'clearTimeout', 'event'}
+
+
+def page_scripts(doc, page):
+    """Source of the inline scripts and of the local script files of a page"""
+    sources = []
+    for script in doc.iter('script'):
+        src = script.get('src')
+        if src is None:
+            sources.append(script.text())
+            continue
+        path = os.path.join(os.path.dirname(os.path.abspath(page)), src.split('?')[0])
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                sources.append(f.read())
+    return '\n'.join(sources)
+
+
+def defines(js, name):
+    return re.search(rf'function\s+{re.escape(name)}\s*\(|\b{re.escape(name)}\s*=', js) is not None
+
+
+@html_pass('scripts')
+def scripts_pass(doc, page, log):
+    """Checks that the JavaScript the markup relies on is part of the page"""
+    js = page_scripts(doc, page)
+    handlers = set()
+    for element in doc.iter():
+        for attr, value, _, _ in element._attrs():
+            if attr.startswith('on') and value:
+                handlers.update(HANDLER_CALL_RE.findall(html.unescape(value)))
+    for name in sorted(handlers - JS_BUILTINS):
+        if not defines(js, name):
+            log.problem(f"handler {name}() is not defined in the page's scripts")
+    if any(element.has_class('reveal') for element in doc.iter()) and '.reveal' not in js:
+        log.problem("elements with class reveal but no script reveals them (they stay invisible)")
+
+
+# --- pipeline ----------------------------------------------------------------
+
+def run(source, page, passes):
+    """Returns (new source, {pass: PassLog})"""
+    doc = parse(source)
+    logs = {}
+    for name in passes:
+        logs[name] = PassLog()
+        PASSES[name](doc, page, logs[name])
+    return doc.serialize(), logs
+
+
+def process_page(page, passes, check=False):
+    """Runs the passes on a page; returns False on problems or, with check, on drift"""
+    with open(page, 'r', encoding='utf-8') as f:
+        source = f.read()
+    updated, logs = run(source, page, passes)
+    name = os.path.relpath(page, REPO_ROOT)
+
+    ok = True
+    if run(updated, page, passes)[0] != updated:
+        print(f"{name}: ❌ a second run would change the page again (a pass is not idempotent)")
+        ok = False
+    for pass_name, log in logs.items():
+        for note in log.notes:
+            print(f"{name}: {pass_name}: {note}")
+        for problem in log.problems:
+            print(f"{name}: {pass_name}: ❌ {problem}")
+            ok = False
+
+    if updated == source:
+        print(f"{name}: up to date")
+    elif check:
+        print(f"{name}: ❌ out of date, run: python html_pipeline.py {name}")
+        diff = list(difflib.unified_diff(source.splitlines(), updated.splitlines(),
+                                         'a/' + name, 'b/' + name, lineterm='', n=0))
+        for line in diff[:40]:
+            print(f"    {line[:160]}")
+        if len(diff) > 40:
+            print(f"    ... {len(diff) - 40} more lines")
+        ok = False
+    else:
+        with open(page, 'w', encoding='utf-8') as f:
+            f.write(updated)
+        changed = sum(1 for line in difflib.ndiff(source.splitlines(), updated.splitlines())
+                      if line.startswith('+ '))
+        print(f"{name}: updated ({changed} lines)")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply the HTML build passes to the site's pages")
+    parser.add_argument('pages', nargs='*',
+                        default=sorted(glob.glob(os.path.join(REPO_ROOT, '*.html'))))
+    parser.add_argument('--pass', dest='passes', action='append', choices=list(PASSES),
+                        help="Run only this pass (repeatable, default: all in order)")
+    parser.add_argument('--check', action='store_true',
+                        help="Do not write; exit 1 if a page would change or has problems")
+    args = parser.parse_args()
+
+    passes = [name for name in PASSES if name in (args.passes or PASSES)]
+    results = [process_page(page, passes, args.check) for page in args.pages]
+    if not args.check:
+        save_image_sizes()
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
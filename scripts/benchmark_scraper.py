@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the theater scraper
+
+Runs the parsing hot spots of scrape_shows.py against saved HTML pages.
+By default the page bodies from the scraper's HTTP cache (data/http-cache)
+are used, so run the scraper once first or pass HTML files explicitly.
+
+Usage:
+    python scripts/benchmark_scraper.py dates [page.html ...]
+    python scripts/benchmark_scraper.py dresden [spielplan.html ...]
+    python scripts/benchmark_scraper.py parser [page.html ...]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import scrape_shows  # noqa: E402
+
+
+def legacy_extract_dates_from_text(text, base_url):
+    """Previous six-regex implementation, kept as the reference for comparison"""
+    events = []
+    
+    # Normalize whitespace to help with multiline dates
+    # Replace multiple whitespaces/newlines with single space
+    normalized_text = re.sub(r'\s+', ' ', text)
+    
+    # Enhanced date patterns for German
+    patterns = [
+        # DD.MM.YYYY with time
+        r'(\d{1,2})\.(\d{1,2})\.(\d{4}).*?(\d{1,2})[:\.](\d{2})',
+        # DD.MM.YYYY without time  
+        r'(\d{1,2})\.(\d{1,2})\.(\d{4})',
+        # DD. MMM YYYY (e.g., 20. September 2025)
+        r'(\d{1,2})\.\s*(Januar|Februar|März|April|Mai|Juni|Juli|August|September|Oktober|November|Dezember)\s*(\d{4})',
+        # DD MMM YYYY without dot (e.g., 17 Okt 2025)
+        r'(\d{1,2})\s+(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez|Januar|Februar|März|April|Juni|Juli|August|September|Oktober|November|Dezember)\s+(\d{4})',
+        # DD. MMM without year (e.g., 17. Okt, 19. Nov) - BUT careful with Premiere dates
+        r'(\d{1,2})\.\s*(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez|Januar|Februar|März|April|Juni|Juli|August|September|Oktober|November|Dezember)',
+        # DD MMM without year or dot (e.g., 17 Okt)
+        r'(\d{1,2})\s+(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez)\s+(?!202)',
+    ]
+    
+    month_map = {
+        'Januar': '01', 'Februar': '02', 'März': '03', 'April': '04',
+        'Mai': '05', 'Juni': '06', 'Juli': '07', 'August': '08',
+        'September': '09', 'Oktober': '10', 'November': '11', 'Dezember': '12',
+        'Jan': '01', 'Feb': '02', 'Mär': '03', 'Apr': '04',
+        'Jun': '06', 'Jul': '07', 'Aug': '08', 'Sep': '09',
+        'Okt': '10', 'Nov': '11', 'Dez': '12'
+    }
+    
+    for pattern in patterns:
+        for match in re.finditer(pattern, normalized_text):
+            try:
+                groups = match.groups()
+                time_display = None # No default fallback
+                
+                if len(groups) == 5:  # With time (DD.MM.YYYY HH:MM)
+                    day, month, year, hour, minute = groups
+                    datetime_str = f"{year}-{month.zfill(2)}-{day.zfill(2)} {hour.zfill(2)}:{minute.zfill(2)}"
+                    time_display = f"{hour}:{minute}"
+                
+                else: # Without time in the match
+                    if len(groups) == 3 and groups[1].isalpha():  # Month name with year
+                        day, month_name, year = groups
+                        month = month_map.get(month_name, '01')
+                    elif len(groups) == 2 and groups[1].isalpha():  # Month name without year (e.g., "17. Okt")
+                        day, month_name = groups
+                        month = month_map.get(month_name, '01')
+                        current_year = datetime.now().year
+                        
+                        # Use a temporary year for now to construct date object
+                        temp_year = current_year
+                        try:
+                            test_date = datetime.strptime(f"{temp_year}-{month}-{day.zfill(2)}", "%Y-%m-%d")
+                            if test_date < datetime.now() - timedelta(days=90):
+                                year = temp_year + 1
+                            else:
+                                year = temp_year
+                        except ValueError:
+                            continue
+                            
+                    else:  # Without time (DD.MM.YYYY)
+                        day, month, year = groups[:3]
+                        
+                    # Look for time after the date match
+                    end_pos = match.end()
+                    text_after = normalized_text[end_pos:end_pos+100]
+                    
+                    # Pattern for time: HH:MM or HH.MM (optionally with Uhr)
+                    time_match = re.search(r'(?:\bum\s+)?(\d{1,2})[:\.](\d{2})(?:\s*Uhr)?', text_after)
+                    if time_match:
+                        h, m = time_match.groups()
+                        time_display = f"{h.zfill(2)}:{m.zfill(2)}"
+                        datetime_str = f"{year}-{month.zfill(2)}-{day.zfill(2)} {time_display}"
+                    else:
+                        # If no time found, skip this event
+                        continue
+
+                # Only future dates
+                if time_display:
+                    event_date = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
+                    if event_date > datetime.now():
+                        events.append({
+                            "date": datetime_str,
+                            "display_date": f"{day.zfill(2)}.{month.zfill(2) if isinstance(month, str) and month.isdigit() else month_map.get(month_name if 'month_name' in locals() else groups[1], '01')}.{year}",
+                            "display_time": time_display,
+                            "ticket_url": base_url
+                        })
+            except Exception as e:
+                # print(f"Error parsing date match: {e}")
+                continue
+    
+    return events
+
+
+def legacy_komet_meta_dates(soup, url):
+    """Previous per-tag ancestor get_text() scan, kept as the reference"""
+    events = []
+    # Look for structured meta tags with startDate
+    meta_tags = soup.find_all('meta', attrs={'itemprop': 'startDate'})
+    for meta_tag in meta_tags:
+        try:
+            start_date = meta_tag.get('content')
+            if start_date:
+                # Parse ISO format: 2025-09-20T19:30:00
+                if 'T' in start_date:
+                    date_part, time_part = start_date.split('T')
+                    year, month, day = date_part.split('-')
+                    hour, minute, _ = time_part.split(':')
+
+                    datetime_str = f"{year}-{month}-{day} {hour}:{minute}"
+
+                    # Only future dates
+                    event_date = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
+                    if event_date > datetime.now():
+                        # Check if this meta tag is within the Der Komet section
+                        parent_element = meta_tag.parent
+                        is_komet = False
+
+                        if parent_element:
+                            # Look for "Der Komet" in the surrounding context
+                            context_text = ""
+                            curr = parent_element
+                            for i in range(5):  # Check up to 5 levels up
+                                if curr:
+                                    context_text += curr.get_text() + " "
+                                    curr = curr.parent
+
+                            if re.search(r'der\s+komet|komet', context_text, re.I):
+                                is_komet = True
+
+                        if is_komet:
+                            events.append({
+                                "date": datetime_str,
+                                "display_date": f"{day}.{month}.{year}",
+                                "display_time": f"{hour}:{minute}",
+                                "ticket_url": url
+                            })
+                            print(f"Found Der Komet date: {day}.{month}.{year} {hour}:{minute}")
+        except Exception as e:
+            print(f"Error parsing meta tag: {e}")
+            continue
+    return events
+
+
+def element_texts(soup):
+    """Texts the scrapers feed into the date extractor for one page"""
+    texts = [soup.get_text()]
+    strategies = [
+        lambda soup: soup.find_all(['div', 'section', 'article'],
+                                   class_=re.compile(r'calendar|spielplan|termine|events', re.I)),
+        lambda soup: soup.find_all('a', href=re.compile(r'termin|date|event')),
+        lambda soup: soup.find_all('tr'),
+        lambda soup: soup.find_all(['div', 'li', 'article'],
+                                   class_=re.compile(r'date|item|card|event-list', re.I)),
+    ]
+    for strategy in strategies:
+        texts.extend(element.get_text() for element in strategy(soup))
+    return texts
+
+
+def best_of(func, repeat):
+    """Fastest wall time of repeat calls to func"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load_pages(paths):
+    if not paths:
+        paths = sorted(glob.glob(os.path.join(scrape_shows.HTTP_CACHE_DIR, '*.html')))
+    if not paths:
+        print(f"No pages found. Run the scraper first or pass HTML files.")
+        sys.exit(1)
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append((path, f.read()))
+    return pages
+
+
+def bench_dates(pages, repeat):
+    """Compare the date extractor against the previous implementation per page"""
+    print(f"{'page':40} {'texts':>6} {'events':>7} {'before':>10} {'after':>10} {'speedup':>8}")
+    total_before = total_after = 0
+    for path, content in pages:
+        texts = element_texts(scrape_shows.make_soup(content))
+        before_events = [legacy_extract_dates_from_text(t, 'x') for t in texts]
+        after_events = [scrape_shows.extract_dates_from_text(t, 'x') for t in texts]
+        if before_events != after_events:
+            print(f"{os.path.basename(path)}: events differ from the previous implementation")
+            sys.exit(1)
+
+        before = best_of(lambda: [legacy_extract_dates_from_text(t, 'x') for t in texts], repeat)
+        after = best_of(lambda: [scrape_shows.extract_dates_from_text(t, 'x') for t in texts], repeat)
+        total_before += before
+        total_after += after
+        event_count = sum(len(e) for e in after_events)
+        print(f"{os.path.basename(path)[:40]:40} {len(texts):>6} {event_count:>7} "
+              f"{before * 1000:>8.1f}ms {after * 1000:>8.1f}ms {before / after:>7.1f}x")
+    print(f"{'total':40} {'':>6} {'':>7} {total_before * 1000:>8.1f}ms "
+          f"{total_after * 1000:>8.1f}ms {total_before / total_after:>7.1f}x")
+
+
+def scaled_page(content, factor):
+    """The page with the listing that holds its meta tags repeated factor times
+
+    A longer spielplan adds entries to the same list, so the contents of the
+    innermost element containing all startDate meta tags are repeated.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    metas = soup.find_all('meta', attrs={'itemprop': 'startDate'})
+    container = soup.body or soup
+    if metas:
+        for ancestor in metas[0].parents:
+            if len(ancestor.find_all('meta', attrs={'itemprop': 'startDate'})) == len(metas):
+                container = ancestor
+                break
+    inner = ''.join(str(child) for child in container.contents)
+    container.clear()
+    container.append(BeautifulSoup(inner * factor, 'html.parser'))
+    return str(soup)
+
+
+def bench_dresden(pages, repeat):
+    """Time the Der Komet meta-tag scan on growing copies of each page
+
+    The previous scan grows with tags x page size, the indexed one should
+    roughly double when the page doubles.
+    """
+    print(f"{'page':32} {'size':>6} {'KB':>7} {'metas':>6} {'before':>10} {'after':>10} {'speedup':>8}")
+    for path, content in pages:
+        for factor in (1, 2, 4, 8):
+            html = scaled_page(content, factor)
+            soup = scrape_shows.make_soup(html)
+            metas = len(soup.find_all('meta', attrs={'itemprop': 'startDate'}))
+            with contextlib.redirect_stdout(io.StringIO()):
+                if legacy_komet_meta_dates(soup, 'x') != scrape_shows.extract_komet_meta_dates(soup, 'x'):
+                    print(f"{os.path.basename(path)}: events differ from the previous implementation",
+                          file=sys.stderr)
+                    sys.exit(1)
+                before = best_of(lambda: legacy_komet_meta_dates(soup, 'x'), repeat)
+                after = best_of(lambda: scrape_shows.extract_komet_meta_dates(soup, 'x'), repeat)
+            print(f"{os.path.basename(path)[:32]:32} {factor:>5}x {len(html) // 1024:>7} {metas:>6} "
+                  f"{before * 1000:>8.1f}ms {after * 1000:>8.1f}ms {before / after:>7.1f}x")
+
+
+def measure_parse(content, parser, parse_only=None):
+    """Parse time (best of 3) and peak traced memory for one parse"""
+    elapsed = best_of(lambda: BeautifulSoup(content, parser, parse_only=parse_only), 3)
+    tracemalloc.start()
+    soup = BeautifulSoup(content, parser, parse_only=parse_only)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, soup
+
+
+def bench_parser(pages):
+    """Parse time and peak memory per page: html.parser vs. lxml vs. strained"""
+    print(f"{'page':32} {'KB':>6} {'parser':24} {'time':>10} {'peak':>10}")
+    for path, content in pages:
+        variants = [('html.parser', 'html.parser', None)]
+        if scrape_shows.HTML_PARSER != 'html.parser':
+            variants.append((scrape_shows.HTML_PARSER, scrape_shows.HTML_PARSER, None))
+        for name, strainer in scrape_shows.PARSE_ONLY.items():
+            variants.append((f"{scrape_shows.HTML_PARSER}+{name}", scrape_shows.HTML_PARSER, strainer))
+
+        for label, parser, strainer in variants:
+            elapsed, peak, soup = measure_parse(content, parser, strainer)
+            # A strainer that keeps nothing does not apply to this page
+            if strainer is not None and not soup.contents:
+                continue
+            print(f"{os.path.basename(path)[:32]:32} {len(content) // 1024:>6} {label:24} "
+                  f"{elapsed * 1000:>8.1f}ms {peak / 1024:>8.0f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for scrape_shows.py")
+    parser.add_argument('benchmark', choices=['dates', 'dresden', 'parser'], help='What to benchmark')
+    parser.add_argument('pages', nargs='*', help='Saved HTML pages (default: HTTP cache)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    if args.benchmark == 'dates':
+        bench_dates(pages, args.repeat)
+    elif args.benchmark == 'dresden':
+        bench_dresden(pages, args.repeat)
+    elif args.benchmark == 'parser':
+        bench_parser(pages)
+
+
+if __name__ == "__main__":
+    main()
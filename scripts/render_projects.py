@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Renders the project grid of index.html from data/projects.json
+
+One catalogue record per production, in grid order:
+
+    {"image": "macbeth",                 base name of images/macbeth.jpg
+     "title": "Macbeth", "genre": "Schauspiel",
+     "venue": "Deutsches Theater Berlin", "year": 2015,   (films: "Regie: ...")
+     "url": "https://...", "credit": "Arno Declair",
+     "alt": "Kostümbild von Susanne Uhl für Macbeth am ...",
+     "added": "2026-02"}                 optional, written as data-year/data-month
+
+The <li>s are written between the projects:begin and projects:end comments
+of index.html. Image paths follow convert_image's variant naming: the
+fullscreen image is compressed/<name>.avif (thumbs/<name>.avif if there is
+none) and the depth map maps/<name>_map.webp if it exists. The <img>
+carries the real width/height of the thumb, so the grid reserves its space
+before anything loads. The page then goes through html_pipeline.py's passes
+(srcset, priority, lqip, dimensions, scripts), so nothing else has to patch
+the grid.
+
+With --incremental, records whose catalogue entry and image files are
+unchanged since the last run are taken from RENDER_CACHE_FILE instead of
+being rendered again (no image headers are read for them).
+
+Usage:
+    python scripts/render_projects.py
+    python scripts/render_projects.py --incremental
+    python scripts/render_projects.py --check      # exit 1 if index.html is out of date
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from html import escape
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'Image Conversion'))
+import html_pipeline  # noqa: E402
+from convert_image import OutputDirs  # noqa: E402
+
+CATALOGUE_FILE = os.path.join(REPO_ROOT, 'data', 'projects.json')
+RENDER_CACHE_FILE = os.path.join(REPO_ROOT, 'data', '.projects-cache.json')
+PAGE_FILE = os.path.join(REPO_ROOT, 'index.html')
+
+# Bump when the markup of an item changes, so cached items are rendered again
+RENDER_VERSION = 2
+
+REGION_RE = re.compile(r'(?P<indent>[ \t]*)<!-- projects:begin[^>]*-->.*?<!-- projects:end -->', re.S)
+BEGIN_MARKER = '<!-- projects:begin (generated by scripts/render_projects.py from data/projects.json) -->'
+END_MARKER = '<!-- projects:end -->'
+
+OPEN_FULLSCREEN = "openFullscreen(this.parentElement.querySelector('img').src, this.parentElement)"
+
+
+def url(path):
+    """Site URL of a file under the repository"""
+    return os.path.relpath(path, REPO_ROOT).replace(os.sep, '/')
+
+
+def record_files(name, dirs):
+    """{variant name: path} of every file an item can show, existing or not"""
+    files = {variant: dirs.path(name, variant)
+             for variant in ('thumbs.jpg', 'thumbs.avif', 'compressed.avif')}
+    files['maps.webp'] = dirs.path(f"{name}_map", 'maps.webp')
+    return files
+
+
+def fingerprint(record, files):
+    """Hash of the record and the size/mtime of its image files"""
+    stats = {}
+    for variant, path in files.items():
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stats[variant] = [stat.st_size, stat.st_mtime_ns]
+    payload = json.dumps([RENDER_VERSION, record, stats], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def render_item(record, files, size):
+    """
+    Lines of one grid <li>, size being the (width, height) of its thumb;
+    srcset, loading priority and placeholder come from the passes
+    """
+    thumb = files['thumbs.jpg']
+    width, height = size
+
+    attrs = ''
+    if record.get('added'):
+        year, month = record['added'].split('-')
+        attrs += f' data-year="{year}" data-month="{month}"'
+    full = files['compressed.avif'] if files['compressed.avif'].exists() else files['thumbs.avif']
+    attrs += f' data-full-avif="{url(full)}"'
+    if files['maps.webp'].exists():
+        attrs += f' data-depth-map="{url(files["maps.webp"])}"'
+
+    img_attrs = f'src="{url(thumb)}" alt="{escape(record["alt"])}" width="{width}" height="{height}"'
+
+    meta = ' · '.join([record['genre'], record['venue'], str(record['year'])])
+    return [
+        f'<li class="reveal"{attrs}>',
+        f'    <div class="image-wrapper" onclick="{OPEN_FULLSCREEN}">',
+        '        <picture>',
+        f'            <source srcset="{url(files["thumbs.avif"])}" type="image/avif">',
+        f'            <img fetchpriority="low" decoding="async" loading="lazy" {img_attrs}>',
+        '        </picture>',
+        f'        <span class="image-credit">© {escape(record["credit"])}</span>',
+        '    </div>',
+        f'    <a href="{escape(record["url"])}" target="_blank" class="project-title">'
+        f'<span class="title-main">{escape(record["title"])}</span>'
+        f'<span class="title-meta">{escape(meta)}</span></a>',
+        '</li>',
+    ]
+
+
+def load_cache():
+    try:
+        with open(RENDER_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    with open(RENDER_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+def render_items(records, cache, dirs):
+    """(lines of all items, new cache, number of items rendered rather than cached)"""
+    items = []
+    for record in records:
+        files = record_files(record['image'], dirs)
+        key = fingerprint(record, files)
+        cached = cache.get(record['image'])
+        items.append((record, files, key, cached['lines'] if cached and cached['fingerprint'] == key else None))
+
+    # The thumb sizes of every item to render, read in one batch
+    thumbs = [files['thumbs.jpg'] for _, files, _, item in items if item is None]
+    for thumb in thumbs:
+        if not thumb.exists():
+            raise FileNotFoundError(f"{url(thumb)} missing (convert images/{thumb.stem}.jpg first)")
+    sizes = html_pipeline.image_sizes(thumbs)
+
+    lines, new_cache, rendered = [], {}, 0
+    for record, files, key, item in items:
+        if item is None:
+            item = render_item(record, files, sizes[files['thumbs.jpg']])
+            rendered += 1
+        new_cache[record['image']] = {'fingerprint': key, 'lines': item}
+        lines.extend(item)
+    return lines, new_cache, rendered
+
+
+def render_page(source, item_lines):
+    match = REGION_RE.search(source)
+    if not match:
+        raise ValueError("index.html has no <!-- projects:begin --> ... <!-- projects:end --> region")
+    indent = match.group('indent')
+    region = '\n'.join(indent + line for line in [BEGIN_MARKER] + item_lines + [END_MARKER])
+    rendered = source[:match.start()] + region + source[match.end():]
+    updated, logs = html_pipeline.run(rendered, PAGE_FILE, list(html_pipeline.PASSES))
+    for name, log in logs.items():
+        for problem in log.problems:
+            print(f"index.html: {name}: ❌ {problem}")
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the project grid of index.html from data/projects.json")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only render records whose entry or image files changed since the last run")
+    parser.add_argument('--check', action='store_true',
+                        help="Do not write; exit 1 if index.html would change")
+    args = parser.parse_args()
+
+    with open(CATALOGUE_FILE, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    with open(PAGE_FILE, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    item_lines, cache, rendered = render_items(records, load_cache() if args.incremental else {},
+                                               OutputDirs.current())
+    updated = render_page(source, item_lines)
+    summary = f"{len(records)} projects, {rendered} rendered, {len(records) - rendered} from cache"
+
+    if updated == source:
+        print(f"index.html: up to date ({summary})")
+    elif args.check:
+        print("index.html: ❌ out of date, run: python scripts/render_projects.py")
+        sys.exit(1)
+    else:
+        with open(PAGE_FILE, 'w', encoding='utf-8') as f:
+            f.write(updated)
+        print(f"index.html: updated ({summary})")
+    if not args.check:
+        save_cache(cache)
+        html_pipeline.save_image_sizes()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Renders the event cards of shows.html from data/shows.json
+
+The cards, the "last updated" line and the Event schema are written as
+static HTML between the shows:begin and shows:end comments of shows.html,
+so the dates are part of the first paint instead of appearing after the
+page has fetched the JSON. Shows without upcoming dates are left out
+(unless marked "listed"), the rest are sorted by their next date. The
+page's script only hides dates that have passed since the last build.
+
+The page then goes through html_pipeline.py's passes, which set the
+loading priority of the card images and preload the first one. Runs in
+the scrape workflow after scrape_shows.py.
+
+Usage:
+    python scripts/render_shows.py
+    python scripts/render_shows.py --check     # exit 1 if shows.html is out of date
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from html import escape
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+import html_pipeline  # noqa: E402
+
+SHOWS_FILE = os.path.join(REPO_ROOT, 'data', 'shows.json')
+PAGE_FILE = os.path.join(REPO_ROOT, 'shows.html')
+
+REGION_RE = re.compile(r'(?P<indent>[ \t]*)<!-- shows:begin[^>]*-->.*?<!-- shows:end -->', re.S)
+BEGIN_MARKER = '<!-- shows:begin (generated by scripts/render_shows.py from data/shows.json) -->'
+END_MARKER = '<!-- shows:end -->'
+
+# Short weekday names as toLocaleDateString('de-DE', {weekday: 'short'}) writes them
+WEEKDAYS = ('Mo.', 'Di.', 'Mi.', 'Do.', 'Fr.', 'Sa.', 'So.')
+
+
+def parse_date(value):
+    """datetime of an event date "YYYY-MM-DD HH:MM" """
+    return datetime.fromisoformat(value.replace(' ', 'T'))
+
+
+def next_date(show, today):
+    """The first event on or after today, or None"""
+    for event in show.get('events') or []:
+        if parse_date(event['date']).date() >= today:
+            return parse_date(event['date'])
+    return None
+
+
+def visible_shows(shows, today):
+    """[(key, show)] with upcoming dates or marked "listed", by next date"""
+    visible = [(key, show) for key, show in shows.items()
+               if next_date(show, today) or show.get('listed')]
+    # Shows without an upcoming date go last, in file order
+    return sorted(visible, key=lambda item: (next_date(item[1], today) is None,
+                                             next_date(item[1], today) or datetime.min))
+
+
+def card_image(show):
+    """(avif or None, jpg) to show for a card, or None if no file exists"""
+    filename = (show.get('image') or '').split('/')[-1]
+    base = re.sub(r'\.(jpg|jpeg|png)$', '', filename, flags=re.I)
+    thumb_jpg = f"images/thumbs/{base}.jpg"
+    thumb_avif = f"images/thumbs/{base}.avif"
+    if base and os.path.exists(os.path.join(REPO_ROOT, thumb_jpg)):
+        avif = thumb_avif if os.path.exists(os.path.join(REPO_ROOT, thumb_avif)) else None
+        return avif, thumb_jpg
+    if show.get('image') and os.path.exists(os.path.join(REPO_ROOT, show['image'])):
+        return None, show['image']
+    return None
+
+
+def div(cls, text):
+    return f'<div class="{cls}">{escape(text)}</div>'
+
+
+def render_card(key, show):
+    """Lines of one .event-card (the markup the page script used to build)"""
+    image = card_image(show)
+    classes = 'event-card' if image else 'event-card event-card--no-image'
+    lines = [f'<div class="{classes}" data-show="{escape(key)}"'
+             + (' data-listed' if show.get('listed') else '') + '>']
+    if image:
+        avif, jpg = image
+        lines.append('    <div class="event-image-wrapper">')
+        lines.append('        <picture>')
+        if avif:
+            lines.append(f'            <source srcset="{avif}" type="image/avif">')
+        lines.append(f'            <img src="{escape(jpg)}" alt="{escape(show["title"])}">')
+        lines.append('        </picture>')
+        lines.append('    </div>')
+
+    primary = [div('event-location', show['theater'])]
+    if show.get('author'):
+        primary.append(div('event-author', f"von {show['author']}"))
+    secondary = []
+    if show.get('director'):
+        secondary.append(div('event-director', f"Regie: {show['director']}"))
+    if show.get('duration'):
+        secondary.append(div('event-duration', f"Dauer: {show['duration']}"))
+
+    lines.append('    <div class="event-content">')
+    lines.append('        <div class="event-header">')
+    lines.append(f'            {div("event-title", show["title"])}')
+    lines.append('            <div class="event-meta">')
+    for row in (primary, secondary):
+        if row:
+            lines.append('                <div class="event-meta-row">')
+            lines.extend(f'                    {cell}' for cell in row)
+            lines.append('                </div>')
+    lines.append('            </div>')
+    lines.append('        </div>')
+
+    events = show.get('events') or []
+    if events:
+        lines.append('        <div class="event-dates">')
+        for event in events:
+            date = parse_date(event['date'])
+            day = f"{WEEKDAYS[date.weekday()]}, {date:%d.%m.%Y}"
+            lines.append(f'            <div class="event-date" data-date="{escape(event["date"])}">')
+            lines.append('                <div class="date-info">')
+            lines.append(f'                    {div("date-day", day)}')
+            lines.append(f'                    {div("date-time", event["display_time"] + " Uhr")}')
+            lines.append('                </div>')
+            lines.append(f'                <a href="{escape(event["ticket_url"])}" target="_blank"'
+                         ' rel="noopener noreferrer" class="date-ticket-link">Tickets</a>')
+            lines.append('            </div>')
+        lines.append('        </div>')
+    else:
+        lines.append(f'        {div("no-events", show.get("note") or "Keine aktuellen Termine verfügbar")}')
+    lines.append('    </div>')
+    lines.append('</div>')
+    return lines
+
+
+def events_schema(shows, now):
+    """ItemList of every upcoming performance (schema.org Event), or None"""
+    upcoming = [(show, event) for show in shows.values() for event in show.get('events') or []
+                if parse_date(event['date']) > now]
+    if not upcoming:
+        return None
+    return {
+        "@context": "https://schema.org",
+        "@type": "ItemList",
+        "itemListElement": [{
+            "@type": "Event",
+            "name": show['title'],
+            "startDate": event['date'].replace(' ', 'T'),
+            "location": {
+                "@type": "Place",
+                "name": show['theater'],
+                "address": {"@type": "PostalAddress", "addressLocality": show['theater']}
+            },
+            "organizer": {"@type": "Organization", "name": show['theater'], "url": show.get('base_url')},
+            "performer": {"@type": "Person", "name": "Susanne Uhl", "jobTitle": "Kostümbildnerin",
+                          "url": "https://susanneuhl.com"},
+            "position": index + 1
+        } for index, (show, event) in enumerate(upcoming)]
+    }
+
+
+def render_region(data, indent, now):
+    """The markup between (and including) the shows:begin/end markers"""
+    lines = [BEGIN_MARKER, '<div class="events-list" id="shows-container">']
+    cards = visible_shows(data['shows'], now.date())
+    for key, show in cards:
+        lines.extend('    ' + line for line in render_card(key, show))
+    if not cards:
+        lines.append('    ' + div('no-events', 'Aktuell sind keine Termine geplant.'))
+    lines.append('</div>')
+
+    updated = datetime.fromisoformat(data['last_updated'])
+    # As Date.toLocaleString('de-DE') writes it: 10.3.2026, 06:53:59
+    stamp = f"{updated.day}.{updated.month}.{updated.year}, {updated:%H:%M:%S}"
+    lines.append(f'<div class="last-updated" id="last-updated">Zuletzt aktualisiert: {stamp}</div>')
+
+    schema = events_schema(data['shows'], now)
+    if schema:
+        payload = json.dumps(schema, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+        lines.append(f'<script type="application/ld+json">{payload}</script>')
+    lines.append(END_MARKER)
+    return '\n'.join(indent + line if line else line for line in lines)
+
+
+def render_page(source, data, now):
+    match = REGION_RE.search(source)
+    if not match:
+        raise ValueError("shows.html has no <!-- shows:begin --> ... <!-- shows:end --> region")
+    rendered = source[:match.start()] + render_region(data, match.group('indent'), now) + source[match.end():]
+    updated, logs = html_pipeline.run(rendered, PAGE_FILE, list(html_pipeline.PASSES))
+    for name, log in logs.items():
+        for problem in log.problems:
+            print(f"shows.html: {name}: ❌ {problem}")
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the event cards of shows.html from data/shows.json")
+    parser.add_argument('--check', action='store_true',
+                        help="Do not write; exit 1 if shows.html would change")
+    args = parser.parse_args()
+
+    with open(SHOWS_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with open(PAGE_FILE, 'r', encoding='utf-8') as f:
+        source = f.read()
+    updated = render_page(source, data, datetime.now())
+
+    cards = updated.count('class="event-card')
+    if updated == source:
+        print(f"shows.html: up to date ({cards} cards)")
+    elif args.check:
+        print("shows.html: ❌ out of date, run: python scripts/render_shows.py")
+        sys.exit(1)
+    else:
+        with open(PAGE_FILE, 'w', encoding='utf-8') as f:
+            f.write(updated)
+        print(f"shows.html: {cards} cards rendered")
+    if not args.check:
+        html_pipeline.save_image_sizes()
+
+
+if __name__ == "__main__":
+    main()
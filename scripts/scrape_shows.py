@@ -5,14 +5,30 @@ Scrapes current show dates from theater websites
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag, NavigableString, CData
 import json
 import re
+import hashlib
+import bisect
+import contextvars
+from dataclasses import dataclass
+from typing import Callable, Optional
 from datetime import datetime, timedelta
 import os
 import time
 import random
-from urllib.parse import urljoin
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit, urldefrag
+
+try:
+    import lxml  # noqa: F401  (only needed as BeautifulSoup tree builder)
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 
 MONTH_MAP = {
     'januar': '01', 'jan': '01',
@@ -29,6 +45,449 @@ MONTH_MAP = {
     'dezember': '12', 'dez': '12'
 }
 
+# Random pause between two requests to the same host (seconds)
+REQUEST_DELAY = (1, 3)
+# Theaters are scraped in parallel, one worker per scraper
+SCRAPE_WORKERS = 8
+
+# Shared HTTP settings for all scrapers
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
+    'Cache-Control': 'no-cache'
+}
+REQUEST_TIMEOUT = 20
+HTTP_RETRIES = 3          # Retries on connection errors and 429/5xx
+HTTP_BACKOFF = 1.0        # Backoff factor: 1s, 2s, 4s, ...
+HTTP_POOL_HOSTS = 16      # Number of hosts to keep connection pools for
+
+SHOWS_FILE = os.path.join('data', 'shows.json')
+SHOWS_MAX_EVENTS = 20
+
+# Every event ever scraped, as an append-only log of changes per run
+EVENTS_FILE = os.path.join('data', 'events.jsonl')
+
+# Partial parsing: scrapers that only read one part of a page pass one of
+# these to make_soup(), so the rest of the page never becomes a tree
+PARSE_ONLY = {
+    'frankfurt_detail': SoupStrainer(id='infodata'),
+}
+
+# On-disk conditional-GET cache (restored between workflow runs)
+HTTP_CACHE_DIR = os.path.join('data', 'http-cache')
+HTTP_CACHE_MAX_AGE_DAYS = 30
+SCRAPE_STATE_FILE = os.path.join(HTTP_CACHE_DIR, 'results.json')
+
+# Oper Frankfurt date pages: parallel requests and how long a start time is trusted
+DETAIL_MAX_IN_FLIGHT = 4
+DETAIL_DELAY = (0.5, 1.5)
+START_TIMES_FILE = os.path.join(HTTP_CACHE_DIR, 'start_times.json')
+START_TIME_MAX_AGE_DAYS = 14
+
+
+class HostThrottle:
+    """Keep a random delay between requests per host instead of globally"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._host_locks = {}
+        self._last_request = {}
+
+    def wait(self, url, low=REQUEST_DELAY[0], high=REQUEST_DELAY[1]):
+        """Block until the host of url may be contacted again"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        # Holding the host lock while sleeping serializes requests to the
+        # same host, while other hosts proceed in parallel
+        with host_lock:
+            last = self._last_request.get(host)
+            if last is not None:
+                remaining = last + random.uniform(low, high) - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+            self._last_request[host] = time.monotonic()
+
+
+throttle = HostThrottle()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(retries=HTTP_RETRIES, backoff=HTTP_BACKOFF):
+    """Build a session with keep-alive connection pools and retry/backoff"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=('GET',),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS,
+        pool_maxsize=SCRAPE_WORKERS,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """Return the module-wide session shared by all scrapers"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+@dataclass(frozen=True)
+class Page:
+    """Body of a fetched page and the sha256 it is compared by between runs"""
+    url: str
+    content: bytes
+    content_hash: str
+
+
+# Pages fetched during this run, so revalidated pages are not requested twice
+_run_pages = {}
+_run_pages_lock = threading.Lock()
+# URLs (and content hashes) read by the scraper running in the current context
+_page_log = contextvars.ContextVar('page_log', default=None)
+
+
+def _cache_paths(url):
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return (os.path.join(HTTP_CACHE_DIR, f"{key}.json"),
+            os.path.join(HTTP_CACHE_DIR, f"{key}.html"))
+
+
+def load_cached_page(url):
+    """Return the cached validators and body for url, or None"""
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            meta['body'] = f.read()
+    except (OSError, ValueError):
+        return None
+    return meta
+
+
+def store_cached_page(url, response, content, content_hash):
+    """Store body and ETag/Last-Modified of a 200 response"""
+    meta_path, body_path = _cache_paths(url)
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    with open(body_path, 'wb') as f:
+        f.write(content)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'sha256': content_hash
+        }, f, indent=2)
+
+
+def prune_http_cache(max_age_days=HTTP_CACHE_MAX_AGE_DAYS):
+    """Drop cache entries that were not used for max_age_days"""
+    if not os.path.isdir(HTTP_CACHE_DIR):
+        return
+    cutoff = time.time() - max_age_days * 86400
+    for name in os.listdir(HTTP_CACHE_DIR):
+        meta_path = os.path.join(HTTP_CACHE_DIR, name)
+        if not name.endswith('.json') or meta_path in (SCRAPE_STATE_FILE, START_TIMES_FILE):
+            continue
+        if os.path.getmtime(meta_path) < cutoff:
+            for path in (meta_path, meta_path[:-len('.json')] + '.html'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def _log_page(url, content_hash):
+    log = _page_log.get()
+    if log is not None:
+        log[url] = content_hash
+
+
+def fetch(url, delay=REQUEST_DELAY):
+    """GET url over the shared session, revalidating against the on-disk cache
+
+    Sends If-None-Match/If-Modified-Since when a cached copy exists and
+    serves the stored body on 304, so callers always get a Page.
+    """
+    url = urldefrag(url).url
+    with _run_pages_lock:
+        page = _run_pages.get(url)
+    if page:
+        _log_page(url, page.content_hash)
+        return page
+
+    cached = load_cached_page(url)
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    throttle.wait(url, *delay)
+    try:
+        response = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and cached:
+            page = Page(url, cached['body'], cached['sha256'])
+            # Mark the entry as used so it survives pruning
+            os.utime(_cache_paths(url)[0])
+        else:
+            response.raise_for_status()
+            content = response.content
+            content_hash = hashlib.sha256(content).hexdigest()
+            page = Page(url, content, content_hash)
+            store_cached_page(url, response, content, content_hash)
+    except Exception:
+        # A failed page must not let the show count as unchanged
+        _log_page(url, None)
+        raise
+
+    with _run_pages_lock:
+        _run_pages[url] = page
+    _log_page(url, page.content_hash)
+    return page
+
+
+def fetch_all(urls, max_in_flight=DETAIL_MAX_IN_FLIGHT, delay=REQUEST_DELAY, record=True):
+    """Fetch several URLs with at most max_in_flight requests at a time
+
+    The per-host delay still applies between request starts. Returns
+    {url: Page}, with the raised exception in place of a Page on failure.
+    With record=False the pages are left out of the show's page log, for
+    pages whose content is cached elsewhere and must not be revalidated
+    before a previous result is reused.
+    """
+    def task(url):
+        if not record:
+            _page_log.set(None)
+        try:
+            return fetch(url, delay=delay)
+        except Exception as e:
+            return e
+
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        # Each request runs in a copy of the caller's context, so the pages
+        # are recorded for the show that is being scraped (unless record is off)
+        futures = {url: pool.submit(contextvars.copy_context().run, task, url) for url in urls}
+        return {url: future.result() for url, future in futures.items()}
+
+
+def make_soup(content, parse_only=None):
+    """Parse HTML with lxml if installed, optionally only the strained part"""
+    return BeautifulSoup(content, HTML_PARSER, parse_only=parse_only)
+
+
+def connection_stats():
+    """Return {host: (requests, connections)} for the shared session's pools"""
+    stats = {}
+    if _session is None:
+        return stats
+    for adapter in {id(a): a for a in _session.adapters.values()}.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_made, connections = stats.get(pool.host, (0, 0))
+            stats[pool.host] = (requests_made + pool.num_requests,
+                                connections + pool.num_connections)
+    return stats
+
+
+def print_connection_stats():
+    """Print how many requests reused an already open connection per host"""
+    stats = connection_stats()
+    if not stats:
+        return
+    print("HTTP connections:")
+    for host, (requests_made, connections) in sorted(stats.items()):
+        reused = max(0, requests_made - connections)
+        print(f"  {host}: {requests_made} requests over {connections} connections ({reused} reused)")
+
+
+def run_concurrently(tasks, max_workers=SCRAPE_WORKERS):
+    """Run the given callables in a thread pool and return their results by key"""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {key: pool.submit(task) for key, task in tasks.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def content_fingerprint(data):
+    """Stable hash of JSON-serialisable data"""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def write_shows_json(shows, path=SHOWS_FILE):
+    """Write shows.json only if the shows changed; returns True if written
+
+    last_updated is left alone on no-change runs, so the file (and the
+    workflow's git diff) stays untouched.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+    except (OSError, ValueError):
+        existing = None
+    if existing and content_fingerprint(existing.get('shows')) == content_fingerprint(shows):
+        return False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"last_updated": datetime.now().isoformat(), "shows": shows},
+                  f, ensure_ascii=False, indent=2)
+    return True
+
+
+class EventStore:
+    """All scraped events keyed by (show, date), backed by EVENTS_FILE
+
+    The file is an append-only log with one change per line:
+    {"run", "show", "date", "op": "add"|"update"|"remove", "event"}.
+    Replaying it gives the current events, including past seasons.
+    Only upcoming events are ever removed, so history stays queryable.
+    """
+
+    def __init__(self, path=EVENTS_FILE):
+        self.path = path
+        self.events = {}
+        self._pending = []
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        self._apply(json.loads(line))
+        except OSError:
+            pass
+
+    def _apply(self, change):
+        key = (change['show'], change['date'])
+        if change['op'] == 'remove':
+            self.events.pop(key, None)
+        else:
+            self.events[key] = change['event']
+
+    def upsert(self, show_key, events, run):
+        """Record a successful scrape of a show and return its changes
+
+        Upcoming events of the show that are no longer listed are removed.
+        """
+        now = datetime.now()
+        changes = []
+        with self._lock:
+            scraped = {event['date']: event for event in events}
+            for date, event in scraped.items():
+                stored = self.events.get((show_key, date))
+                if stored != event:
+                    changes.append({"run": run, "show": show_key, "date": date,
+                                    "op": "add" if stored is None else "update", "event": event})
+            for (key, date) in list(self.events):
+                if (key == show_key and date not in scraped
+                        and datetime.strptime(date, "%Y-%m-%d %H:%M") > now):
+                    changes.append({"run": run, "show": show_key, "date": date, "op": "remove"})
+            for change in changes:
+                self._apply(change)
+            self._pending.extend(changes)
+        return changes
+
+    def show_events(self, show_key, upcoming_only=True):
+        """Stored events of a show, sorted by date"""
+        now = datetime.now()
+        events = [event for (key, date), event in self.events.items()
+                  if key == show_key
+                  and (not upcoming_only or datetime.strptime(date, "%Y-%m-%d %H:%M") > now)]
+        return sorted(events, key=lambda e: e['date'])
+
+    def save(self):
+        """Append the changes of this run to the log; returns their number"""
+        if not self._pending:
+            return 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for change in self._pending:
+                f.write(json.dumps(change, ensure_ascii=False, sort_keys=True) + '\n')
+        count, self._pending = len(self._pending), []
+        return count
+
+
+def load_scrape_state():
+    """Load the pages and results of the previous run per show"""
+    try:
+        with open(SCRAPE_STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_scrape_state(state):
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    with open(SCRAPE_STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+
+def _reusable_result(previous):
+    """Return the previous result with past events dropped"""
+    events, *details = previous['result']
+    return (upcoming_events(events), *details)
+
+
+def pages_unchanged(pages):
+    """Revalidate the given {url: hash} pages and check none of them changed
+
+    The pages are requested in parallel like fetch_all() does, so only
+    pages on the same host wait for each other.
+    """
+    if not pages or None in pages.values():
+        return False
+    for url, page in fetch_all(list(pages)).items():
+        if isinstance(page, Exception):
+            print(f"Error revalidating {url}: {page}")
+            return False
+        if page.content_hash != pages[url]:
+            return False
+    return True
+
+
+def run_cached(key, scraper, previous_state, state):
+    """Run a scraper, or reuse its previous result if none of its pages changed"""
+    previous = previous_state.get(key)
+    if previous and pages_unchanged(previous['pages']):
+        print(f"{key}: pages unchanged, reusing previous result")
+        state[key] = previous
+        return _reusable_result(previous)
+
+    pages = {}
+    token = _page_log.set(pages)
+    try:
+        result = scraper()
+    finally:
+        _page_log.reset(token)
+    state[key] = {
+        'pages': pages,
+        'result': list(result),
+        'fingerprint': content_fingerprint(list(result))
+    }
+    if previous and previous.get('fingerprint') == state[key]['fingerprint']:
+        print(f"{key}: pages changed, but events and details are the same")
+    return result
+
 def extract_director(text):
     """Extract director from text like 'Regie: Name Name'"""
     # Normalize whitespace first
@@ -152,6 +611,89 @@ def extract_duration(text):
     
     return None
 
+class TextIndex:
+    """Where a pattern occurs in the get_text() of every tag of a document
+
+    The document text is built once in a single traversal, together with
+    the character span each tag's get_text() covers in it. Asking whether a
+    tag's text contains the pattern is then a bisect instead of serializing
+    the tag's whole subtree again.
+    """
+
+    def __init__(self, root, pattern, flags=re.I):
+        chunks = []
+        offset = 0
+        self._spans = {}
+        stack = [(root, None)]
+        while stack:
+            node, start = stack.pop()
+            if start is not None:
+                self._spans[id(node)] = (start, offset)
+            elif isinstance(node, Tag):
+                stack.append((node, offset))
+                stack.extend((child, None) for child in reversed(node.contents))
+            # Same strings as Tag.get_text(): no comments, scripts or styles
+            elif type(node) in (NavigableString, CData):
+                chunks.append(node)
+                offset += len(node)
+        self._matches = [(m.start(), m.end()) for m in re.finditer(pattern, ''.join(chunks), flags)]
+        self._match_starts = [m[0] for m in self._matches]
+
+    def contains(self, tag):
+        """True if the pattern occurs in tag.get_text()"""
+        start, end = self._spans[id(tag)]
+        i = bisect.bisect_left(self._match_starts, start)
+        return i < len(self._matches) and self._matches[i][1] <= end
+
+
+def extract_komet_meta_dates(soup, url):
+    """Der Komet dates from itemprop=startDate meta tags
+
+    A meta tag counts if "Komet" appears in the text of its parent or one of
+    the four ancestors above it. Since every level's text contains the one
+    below, only the topmost of these ancestors has to be checked.
+    """
+    events = []
+    komet_index = None
+    for meta_tag in soup.find_all('meta', attrs={'itemprop': 'startDate'}):
+        try:
+            start_date = meta_tag.get('content')
+            # Parse ISO format: 2025-09-20T19:30:00
+            if not start_date or 'T' not in start_date:
+                continue
+            date_part, time_part = start_date.split('T')
+            year, month, day = date_part.split('-')
+            hour, minute, _ = time_part.split(':')
+
+            datetime_str = f"{year}-{month}-{day} {hour}:{minute}"
+
+            # Only future dates
+            event_date = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
+            if event_date <= datetime.now() or not meta_tag.parent:
+                continue
+
+            # Check if this meta tag is within the Der Komet section (up to 5 levels up)
+            context = meta_tag.parent
+            for _ in range(4):
+                if context.parent:
+                    context = context.parent
+            if komet_index is None:
+                komet_index = TextIndex(soup, r'komet')
+            if komet_index.contains(context):
+                events.append({
+                    "date": datetime_str,
+                    "display_date": f"{day}.{month}.{year}",
+                    "display_time": f"{hour}:{minute}",
+                    "ticket_url": url
+                })
+                print(f"Found Der Komet date: {day}.{month}.{year} {hour}:{minute}")
+        except Exception as e:
+            print(f"Error parsing meta tag: {e}")
+            continue
+
+    return events
+
+
 def scrape_staatsschauspiel_dresden():
     """Scrape Der Komet dates from Staatsschauspiel Dresden"""
     events = []
@@ -168,23 +710,9 @@ def scrape_staatsschauspiel_dresden():
     
     for url in urls:
         try:
-            # ... headers and response handling ...
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Cache-Control': 'no-cache'
-            }
-            
-            # Add random delay to avoid being blocked
-            time.sleep(random.uniform(1, 3))
-            
-            response = requests.get(url, headers=headers, timeout=20)
-            response.raise_for_status()
+            response = fetch(url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             page_text = soup.get_text(separator=' ')
             
             # Try to extract director if not found yet
@@ -200,49 +728,7 @@ def scrape_staatsschauspiel_dresden():
                         author = match.group(1)
             
             # Look for structured meta tags with startDate
-            meta_tags = soup.find_all('meta', attrs={'itemprop': 'startDate'})
-            for meta_tag in meta_tags:
-                try:
-                    start_date = meta_tag.get('content')
-                    if start_date:
-                        # Parse ISO format: 2025-09-20T19:30:00
-                        if 'T' in start_date:
-                            date_part, time_part = start_date.split('T')
-                            year, month, day = date_part.split('-')
-                            hour, minute, _ = time_part.split(':')
-                            
-                            datetime_str = f"{year}-{month}-{day} {hour}:{minute}"
-                            
-                            # Only future dates
-                            event_date = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-                            if event_date > datetime.now():
-                                # Check if this meta tag is within the Der Komet section
-                                parent_element = meta_tag.parent
-                                is_komet = False
-                                
-                                if parent_element:
-                                    # Look for "Der Komet" in the surrounding context
-                                    context_text = ""
-                                    curr = parent_element
-                                    for i in range(5):  # Check up to 5 levels up
-                                        if curr:
-                                            context_text += curr.get_text() + " "
-                                            curr = curr.parent
-                                    
-                                    if re.search(r'der\s+komet|komet', context_text, re.I):
-                                        is_komet = True
-                                    
-                                if is_komet:
-                                    events.append({
-                                        "date": datetime_str,
-                                        "display_date": f"{day}.{month}.{year}",
-                                        "display_time": f"{hour}:{minute}",
-                                        "ticket_url": url
-                                    })
-                                    print(f"Found Der Komet date: {day}.{month}.{year} {hour}:{minute}")
-                except Exception as e:
-                    print(f"Error parsing meta tag: {e}")
-                    continue
+            events.extend(extract_komet_meta_dates(soup, url))
             
             # If no structured data found, try text-based approach
             if not events:
@@ -294,101 +780,166 @@ def extract_komet_dates_from_page(page_text, base_url):
     
     return events
 
+# Date extraction: all patterns are compiled once at import time
+_WHITESPACE_RE = re.compile(r'\s+')
+_DIGIT_RUN_RE = re.compile(r'\d+')
+_TIME_RE = re.compile(r'(\d{1,2})[:\.](\d{2})')
+
+_MONTHS_SHORT = 'Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez'
+_MONTHS_LONG = 'Januar|Februar|März|April|Mai|Juni|Juli|August|September|Oktober|November|Dezember'
+_MONTHS_ANY = f'{_MONTHS_SHORT}|Januar|Februar|März|April|Juni|Juli|August|September|Oktober|November|Dezember'
+
+# Enhanced date patterns for German, in the order their events are reported:
+# (pattern, where the time is taken from, whether the month is numeric).
+# The time is either anywhere after the date ('after') or within the next
+# TIME_WINDOW characters ('window').
+DATE_PATTERNS = [
+    # DD.MM.YYYY with time
+    (re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4})'), 'after', True),
+    # DD.MM.YYYY without time
+    (re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4})'), 'window', True),
+    # DD. MMM YYYY (e.g., 20. September 2025)
+    (re.compile(rf'(\d{{1,2}})\.\s*({_MONTHS_LONG})\s*(\d{{4}})'), 'window', False),
+    # DD MMM YYYY without dot (e.g., 17 Okt 2025)
+    (re.compile(rf'(\d{{1,2}})\s+({_MONTHS_ANY})\s+(\d{{4}})'), 'window', False),
+    # DD. MMM without year (e.g., 17. Okt, 19. Nov) - BUT careful with Premiere dates
+    (re.compile(rf'(\d{{1,2}})\.\s*({_MONTHS_ANY})'), 'window', False),
+    # DD MMM without year or dot (e.g., 17 Okt)
+    (re.compile(rf'(\d{{1,2}})\s+({_MONTHS_SHORT})\s+(?!202)'), 'window', False),
+]
+TIME_WINDOW = 100
+
+MONTH_NAME_MAP = {
+    'Januar': '01', 'Februar': '02', 'März': '03', 'April': '04',
+    'Mai': '05', 'Juni': '06', 'Juli': '07', 'August': '08',
+    'September': '09', 'Oktober': '10', 'November': '11', 'Dezember': '12',
+    'Jan': '01', 'Feb': '02', 'Mär': '03', 'Apr': '04',
+    'Jun': '06', 'Jul': '07', 'Aug': '08', 'Sep': '09',
+    'Okt': '10', 'Nov': '11', 'Dez': '12'
+}
+
+
+def _scan_date_tokens(text):
+    """Scan the text once for positions where a date or a time can start
+
+    Every pattern starts with one or two digits followed by '.', ':' or a
+    space, so only the last two digits of each digit run are candidates.
+    Returns (numeric_starts, named_starts, times): starts of DD.MM. dates,
+    starts of dates with a month name, and times as (start, end, hour, minute).
+    """
+    numeric_starts = []
+    named_starts = []
+    times = []
+    for run in _DIGIT_RUN_RE.finditer(text):
+        run_start, run_end = run.span()
+        follow = text[run_end:run_end + 1]
+        if not follow or follow not in '.: ':
+            continue
+        # What comes after the separator decides which patterns can match
+        after = text[run_end + 1:run_end + 2]
+        if follow == '.' and after == ' ':
+            after = text[run_end + 2:run_end + 3]
+        for pos in range(max(run_start, run_end - 2), run_end):
+            if follow == '.' and after.isdigit():
+                numeric_starts.append(pos)
+            elif follow != ':' and after.isalpha():
+                named_starts.append(pos)
+            if follow != ' ':
+                time_match = _TIME_RE.match(text, pos)
+                if time_match:
+                    times.append((pos, time_match.end(), *time_match.groups()))
+    return numeric_starts, named_starts, times
+
+
+def _time_after(times, time_starts, pos, limit=None):
+    """First time starting at or after pos (ending before limit, if given)"""
+    i = bisect.bisect_left(time_starts, pos)
+    if i == len(times):
+        return None
+    # Time ends only grow with their start, so the first one decides
+    if limit is not None and times[i][1] > limit:
+        return None
+    return times[i]
+
+
 def extract_dates_from_text(text, base_url):
-    """Extract dates from text content"""
-    events = []
-    
+    """Extract dates from text content
+
+    Single pass over the text: candidate positions are collected once, then
+    each pattern is matched anchored at those positions with the same
+    non-overlapping semantics as re.finditer.
+    """
     # Normalize whitespace to help with multiline dates
-    # Replace multiple whitespaces/newlines with single space
-    normalized_text = re.sub(r'\s+', ' ', text)
-    
-    # Enhanced date patterns for German
-    patterns = [
-        # DD.MM.YYYY with time
-        r'(\d{1,2})\.(\d{1,2})\.(\d{4}).*?(\d{1,2})[:\.](\d{2})',
-        # DD.MM.YYYY without time  
-        r'(\d{1,2})\.(\d{1,2})\.(\d{4})',
-        # DD. MMM YYYY (e.g., 20. September 2025)
-        r'(\d{1,2})\.\s*(Januar|Februar|März|April|Mai|Juni|Juli|August|September|Oktober|November|Dezember)\s*(\d{4})',
-        # DD MMM YYYY without dot (e.g., 17 Okt 2025)
-        r'(\d{1,2})\s+(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez|Januar|Februar|März|April|Juni|Juli|August|September|Oktober|November|Dezember)\s+(\d{4})',
-        # DD. MMM without year (e.g., 17. Okt, 19. Nov) - BUT careful with Premiere dates
-        r'(\d{1,2})\.\s*(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez|Januar|Februar|März|April|Juni|Juli|August|September|Oktober|November|Dezember)',
-        # DD MMM without year or dot (e.g., 17 Okt)
-        r'(\d{1,2})\s+(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez)\s+(?!202)',
-    ]
-    
-    month_map = {
-        'Januar': '01', 'Februar': '02', 'März': '03', 'April': '04',
-        'Mai': '05', 'Juni': '06', 'Juli': '07', 'August': '08',
-        'September': '09', 'Oktober': '10', 'November': '11', 'Dezember': '12',
-        'Jan': '01', 'Feb': '02', 'Mär': '03', 'Apr': '04',
-        'Jun': '06', 'Jul': '07', 'Aug': '08', 'Sep': '09',
-        'Okt': '10', 'Nov': '11', 'Dez': '12'
-    }
-    
-    for pattern in patterns:
-        for match in re.finditer(pattern, normalized_text):
+    normalized_text = _WHITESPACE_RE.sub(' ', text)
+    numeric_starts, named_starts, times = _scan_date_tokens(normalized_text)
+    if not numeric_starts and not named_starts:
+        return []
+    time_starts = [t[0] for t in times]
+    now = datetime.now()
+
+    events = []
+    for pattern, time_source, numeric in DATE_PATTERNS:
+        next_start = 0
+        for pos in (numeric_starts if numeric else named_starts):
+            if pos < next_start:
+                continue
+            match = pattern.match(normalized_text, pos)
+            if not match:
+                continue
+
             try:
                 groups = match.groups()
-                time_display = None # No default fallback
-                
-                if len(groups) == 5:  # With time (DD.MM.YYYY HH:MM)
-                    day, month, year, hour, minute = groups
+                if time_source == 'after':
+                    # DD.MM.YYYY followed by a time anywhere later in the text
+                    time_token = _time_after(times, time_starts, match.end())
+                    if not time_token:
+                        continue
+                    next_start = time_token[1]
+                    day, month, year = groups
+                    hour, minute = time_token[2:]
                     datetime_str = f"{year}-{month.zfill(2)}-{day.zfill(2)} {hour.zfill(2)}:{minute.zfill(2)}"
                     time_display = f"{hour}:{minute}"
-                
-                else: # Without time in the match
-                    if len(groups) == 3 and groups[1].isalpha():  # Month name with year
-                        day, month_name, year = groups
-                        month = month_map.get(month_name, '01')
-                    elif len(groups) == 2 and groups[1].isalpha():  # Month name without year (e.g., "17. Okt")
-                        day, month_name = groups
-                        month = month_map.get(month_name, '01')
-                        current_year = datetime.now().year
-                        
-                        # Use a temporary year for now to construct date object
-                        temp_year = current_year
-                        try:
-                            test_date = datetime.strptime(f"{temp_year}-{month}-{day.zfill(2)}", "%Y-%m-%d")
-                            if test_date < datetime.now() - timedelta(days=90):
-                                year = temp_year + 1
-                            else:
-                                year = temp_year
-                        except ValueError:
-                            continue
-                            
-                    else:  # Without time (DD.MM.YYYY)
-                        day, month, year = groups[:3]
-                        
-                    # Look for time after the date match
-                    end_pos = match.end()
-                    text_after = normalized_text[end_pos:end_pos+100]
-                    
-                    # Pattern for time: HH:MM or HH.MM (optionally with Uhr)
-                    time_match = re.search(r'(?:\bum\s+)?(\d{1,2})[:\.](\d{2})(?:\s*Uhr)?', text_after)
-                    if time_match:
-                        h, m = time_match.groups()
-                        time_display = f"{h.zfill(2)}:{m.zfill(2)}"
-                        datetime_str = f"{year}-{month.zfill(2)}-{day.zfill(2)} {time_display}"
+                else:
+                    next_start = match.end()
+                    if groups[1].isalpha():
+                        day, month_name = groups[:2]
+                        month = MONTH_NAME_MAP.get(month_name, '01')
+                        if len(groups) == 3:
+                            year = groups[2]
+                        else:
+                            # Month name without year (e.g., "17. Okt")
+                            year = now.year
+                            try:
+                                test_date = datetime(year, int(month), int(day))
+                            except ValueError:
+                                continue
+                            if test_date < now - timedelta(days=90):
+                                year += 1
                     else:
+                        day, month, year = groups
+
+                    # Look for time after the date match (HH:MM or HH.MM, optionally with Uhr)
+                    time_token = _time_after(times, time_starts, match.end(),
+                                             limit=match.end() + TIME_WINDOW)
+                    if not time_token:
                         # If no time found, skip this event
                         continue
+                    hour, minute = time_token[2:]
+                    time_display = f"{hour.zfill(2)}:{minute.zfill(2)}"
+                    datetime_str = f"{year}-{month.zfill(2)}-{day.zfill(2)} {time_display}"
 
                 # Only future dates
-                if time_display:
-                    event_date = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-                    if event_date > datetime.now():
-                        events.append({
-                            "date": datetime_str,
-                            "display_date": f"{day.zfill(2)}.{month.zfill(2) if isinstance(month, str) and month.isdigit() else month_map.get(month_name if 'month_name' in locals() else groups[1], '01')}.{year}",
-                            "display_time": time_display,
-                            "ticket_url": base_url
-                        })
+                if datetime(int(year), int(month), int(day), int(hour), int(minute)) > now:
+                    events.append({
+                        "date": datetime_str,
+                        "display_date": f"{day.zfill(2)}.{month.zfill(2)}.{year}",
+                        "display_time": time_display,
+                        "ticket_url": base_url
+                    })
             except Exception as e:
                 # print(f"Error parsing date match: {e}")
                 continue
-    
+
     return events
 
 def extract_dates_from_element(element, base_url):
@@ -430,7 +981,7 @@ def clean_and_sort_events(events):
     for day_events in events_by_day.values():
         final_events.extend(day_events)
     
-    return sorted(final_events, key=lambda x: x['date'])[:20]
+    return sorted(final_events, key=lambda x: x['date'])
 
 
 def parse_german_date(date_text):
@@ -480,19 +1031,9 @@ def scrape_dnt_weimar_dumme_jahre():
     url = "https://www.dnt-weimar.de/de/programm/stueck-detail.php?SID=3520"
 
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
-            'Cache-Control': 'no-cache'
-        }
-
-        time.sleep(random.uniform(1, 3))
+        response = fetch(url)
 
-        response = requests.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         
         # Try to extract director
         director = extract_director(soup.get_text(separator=' '))
@@ -551,17 +1092,8 @@ def scrape_oper_leipzig():
     
     # 1. Fetch details page for director
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
-            'Cache-Control': 'no-cache'
-        }
-        time.sleep(random.uniform(1, 3))
-        
-        response = requests.get(url_details, headers=headers, timeout=20)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        response = fetch(url_details)
+        soup = make_soup(response.content)
         
         page_text_details = soup.get_text(separator=' ')
         director = extract_director(page_text_details)
@@ -582,12 +1114,9 @@ def scrape_oper_leipzig():
 
     # 2. Fetch dates from profile page
     try:
-        time.sleep(random.uniform(1, 3))
+        response = fetch(url_dates)
         
-        response = requests.get(url_dates, headers=headers, timeout=20)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         page_text = soup.get_text(separator=' ')
         
         # Look for Undine specifically in the full page text
@@ -639,22 +1168,9 @@ def scrape_theater_bonn():
     ticket_url = "https://www.theater-bonn.de/de/programm/sankt-falstaff/221198#dates-and-tickets"
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache'
-        }
-        
-        # Add random delay to avoid being blocked
-        time.sleep(random.uniform(1, 3))
-        
-        response = requests.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
+        response = fetch(url)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         
         # Try to extract director and duration
         page_text = soup.get_text(separator=' ')
@@ -781,19 +1297,9 @@ def scrape_dhaus_krieg_und_frieden():
     url = "https://www.dhaus.de/programm/a-z/krieg-und-frieden/"
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
-            'Cache-Control': 'no-cache'
-        }
-        
-        time.sleep(random.uniform(1, 3))
-        
-        response = requests.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
+        response = fetch(url)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         page_text = soup.get_text(separator=' ')
         
         # Extract director, duration, and author
@@ -864,19 +1370,9 @@ def scrape_staatstheater_cottbus_der_frieden():
     url = "https://www.staatstheater-cottbus.de/de/programm/repertoire/artikel-der_frieden.html"
 
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
-            'Cache-Control': 'no-cache'
-        }
+        response = fetch(url)
 
-        time.sleep(random.uniform(1, 3))
-
-        response = requests.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         page_text = soup.get_text(separator=' ')
 
         # Author from teaser ("Von Peter Hacks")
@@ -963,19 +1459,9 @@ def scrape_buehnen_bern_ewige_sonne():
     url = "https://buehnenbern.ch/spielplan/programm/ewige-sonne/"
 
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
-            'Cache-Control': 'no-cache'
-        }
-
-        time.sleep(random.uniform(1, 3))
-
-        response = requests.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
+        response = fetch(url)
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         page_text = soup.get_text(separator=' ')
 
         # Author: "von Charles Ferdinand Ramuz"
@@ -1051,6 +1537,43 @@ def scrape_buehnen_bern_ewige_sonne():
 
     return clean_and_sort_events(events), director, duration, author
 
+def extract_frankfurt_start_time(detail_soup):
+    """Start time from the "Beginn" entry of an Oper Frankfurt date page"""
+    for dt in detail_soup.select('#infodata dt'):
+        if dt.get_text(strip=True) == 'Beginn':
+            dd = dt.find_next_sibling('dd')
+            if dd:
+                return extract_time(dd.get_text(' ', strip=True))
+            break
+    return None
+
+
+def load_start_times():
+    """Start times of Oper Frankfurt dates by id_datum from previous runs"""
+    try:
+        with open(START_TIMES_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_start_times(start_times):
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    with open(START_TIMES_FILE, 'w', encoding='utf-8') as f:
+        json.dump(start_times, f, indent=2, sort_keys=True)
+
+
+def cached_start_time(start_times, id_datum):
+    """The cached start time if it was checked recently enough, else None"""
+    cached = start_times.get(id_datum)
+    if not cached:
+        return None
+    checked = datetime.fromisoformat(cached['checked'])
+    if datetime.now() - checked > timedelta(days=START_TIME_MAX_AGE_DAYS):
+        return None
+    return cached['time']
+
+
 def scrape_oper_frankfurt_flavio():
     """Scrape Flavio dates from Oper Frankfurt"""
     events = []
@@ -1061,19 +1584,9 @@ def scrape_oper_frankfurt_flavio():
     url = "https://oper-frankfurt.de/de/spielplan/flavio/"
 
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
-            'Cache-Control': 'no-cache'
-        }
-
-        time.sleep(random.uniform(1, 3))
+        response = fetch(url)
 
-        response = requests.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
 
         # Komponist aus dem Artikel-Header ("Georg Friedrich Händel 1685–1759")
         composer_el = soup.select_one('.article-header h4')
@@ -1117,27 +1630,47 @@ def scrape_oper_frankfurt_flavio():
                 if not day_match:
                     continue
                 date_entries.append({
+                    'id_datum': id_match.group(1),
                     'day': day_match.group(1).zfill(2),
                     'month': month,
                     'year': year,
                     'ticket_url': f"https://oper-frankfurt.de/de/spielplan/flavio/?id_datum={id_match.group(1)}#date"
                 })
 
-        # Die Uhrzeit steht nur auf der Detailseite des jeweiligen Termins ("Beginn")
+        # Die Uhrzeit steht nur auf der Detailseite des jeweiligen Termins ("Beginn").
+        # Bekannte Beginnzeiten kommen aus dem Cache; fehlende Detailseiten werden
+        # parallel geladen, vergangene Tage gar nicht.
+        start_times = load_start_times()
+        today = datetime.now().strftime("%Y-%m-%d")
+        missing = [
+            entry for entry in date_entries
+            if f"{entry['year']}-{entry['month']}-{entry['day']}" >= today
+            and not cached_start_time(start_times, entry['id_datum'])
+        ]
+        # Not part of the page log: the start times are cached in START_TIMES_FILE,
+        # so a reused result never needs the detail pages revalidated
+        details = fetch_all([entry['ticket_url'] for entry in missing], delay=DETAIL_DELAY, record=False)
+        for entry in missing:
+            detail = details[entry['ticket_url']]
+            if isinstance(detail, Exception):
+                print(f"Error fetching Oper Frankfurt date detail: {detail}")
+                continue
+            try:
+                time_str = extract_frankfurt_start_time(
+                    make_soup(detail.content, PARSE_ONLY['frankfurt_detail']))
+            except Exception as e:
+                print(f"Error parsing Oper Frankfurt date detail: {e}")
+                continue
+            if time_str:
+                start_times[entry['id_datum']] = {
+                    'time': time_str,
+                    'checked': datetime.now().isoformat(timespec='seconds')
+                }
+        save_start_times(start_times)
+
         for entry in date_entries:
             try:
-                time.sleep(random.uniform(0.5, 1.5))
-                detail = requests.get(entry['ticket_url'], headers=headers, timeout=20)
-                detail.raise_for_status()
-                detail_soup = BeautifulSoup(detail.content, 'html.parser')
-
-                time_str = None
-                for dt in detail_soup.select('#infodata dt'):
-                    if dt.get_text(strip=True) == 'Beginn':
-                        dd = dt.find_next_sibling('dd')
-                        if dd:
-                            time_str = extract_time(dd.get_text(' ', strip=True))
-                        break
+                time_str = cached_start_time(start_times, entry['id_datum'])
                 if not time_str:
                     continue
 
@@ -1161,214 +1694,224 @@ def scrape_oper_frankfurt_flavio():
 
     return clean_and_sort_events(events), director, duration, author
 
+@dataclass(frozen=True)
+class Show:
+    """A production on the dates page and how its dates are scraped
+
+    scrape returns (events, director, duration) or (events, director,
+    duration, author). Shows without a scraper are published with the
+    static director/author/duration given here and no events.
+    """
+    key: str
+    title: str
+    theater: str
+    image: str
+    base_url: str
+    scrape: Optional[Callable] = None
+    director: Optional[str] = None
+    author: Optional[str] = None
+    duration: Optional[str] = None
+    listed: bool = True
+    note: Optional[str] = None
+
+    def entry(self, result):
+        """The show's entry in shows.json for a scrape result"""
+        events, director, duration, *author = result
+        entry = {"title": self.title, "theater": self.theater, "director": director}
+        if author:
+            entry["author"] = author[0]
+        entry.update({"duration": duration, "image": self.image, "base_url": self.base_url})
+        if not self.listed:
+            entry["listed"] = False
+        if self.note:
+            entry["note"] = self.note
+        entry["events"] = events
+        return entry
+
+
+SHOWS = [
+    Show(
+        key="dumme-jahre",
+        title="Dumme Jahre",
+        theater="Deutsches Nationaltheater Weimar",
+        image="images/dumme-jahre.jpg",
+        base_url="https://www.dnt-weimar.de/de/programm/stueck-detail.php?SID=3520#event-tickets",
+        scrape=scrape_dnt_weimar_dumme_jahre
+    ),
+    Show(
+        key="sankt-falstaff",
+        title="Sankt Falstaff",
+        theater="Theater Bonn",
+        image="images/sankt-falstaff.jpg",
+        base_url="https://www.theater-bonn.de/de/programm/sankt-falstaff/221198#dates-and-tickets",
+        scrape=scrape_theater_bonn
+    ),
+    Show(
+        key="der-komet",
+        title="Der Komet",
+        theater="Staatsschauspiel Dresden",
+        image="images/der-komet.jpg",
+        base_url="https://tickets.staatsschauspiel-dresden.de/webshop/webticket/eventlist?production=709",
+        scrape=scrape_staatsschauspiel_dresden
+    ),
+    Show(
+        key="undine",
+        title="Undine",
+        theater="Oper Leipzig",
+        image="images/undine.jpg",
+        base_url="https://www.oper-leipzig.de/de/ensemble/person/susanne-uhl/1902",
+        scrape=scrape_oper_leipzig
+    ),
+    Show(
+        key="krieg-und-frieden",
+        title="Krieg und Frieden",
+        theater="Düsseldorfer Schauspielhaus",
+        image="images/thumbs/krieg-und-frieden.jpg",
+        base_url="https://www.dhaus.de/programm/a-z/krieg-und-frieden/",
+        scrape=scrape_dhaus_krieg_und_frieden
+    ),
+    # Der Frieden & Ewige Sonne: derzeit komplett deaktiviert (Aug 2026) –
+    # kein Scrape, auf der Website ausgeblendet via listed=False.
+    # Zum Reaktivieren: scrape=scrape_staatstheater_cottbus_der_frieden bzw.
+    # scrape=scrape_buehnen_bern_ewige_sonne setzen und listed/note entfernen.
+    Show(
+        key="der-frieden",
+        title="Der Frieden",
+        theater="Staatstheater Cottbus",
+        image="images/thumbs/der-frieden.jpg",
+        base_url="https://www.staatstheater-cottbus.de/de/programm/repertoire/artikel-der_frieden.html",
+        director="Christina Friedrich",
+        author="Peter Hacks",
+        listed=False,
+        note="Termine folgen in Kürze"
+    ),
+    Show(
+        key="ewige-sonne",
+        title="Ewige Sonne",
+        theater="Bühnen Bern",
+        image="images/thumbs/ewige-sonne.jpg",
+        base_url="https://buehnenbern.ch/spielplan/programm/ewige-sonne/",
+        director="Tilmann Köhler",
+        author="Charles Ferdinand Ramuz",
+        listed=False,
+        note="Termine folgen in Kürze"
+    ),
+    Show(
+        key="flavio",
+        title="Flavio",
+        theater="Oper Frankfurt",
+        image="images/thumbs/flavio.jpg",
+        base_url="https://oper-frankfurt.de/de/spielplan/flavio/",
+        scrape=scrape_oper_frankfurt_flavio
+    ),
+]
+
+
+def load_shows_json(path=SHOWS_FILE):
+    """The shows of the last published shows.json, or {}"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('shows', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def upcoming_events(events):
+    now = datetime.now()
+    return [e for e in events if datetime.strptime(e['date'], "%Y-%m-%d %H:%M") > now]
+
+
+def scrape_show(show, previous_state, state):
+    """Scrape one show; raises if it failed and its result must not be used"""
+    if show.scrape is None:
+        return [], show.director, show.duration, show.author
+
+    result = run_cached(show.key, show.scrape, previous_state, state)
+    pages = state.get(show.key, {}).get('pages', {})
+    # The scrapers catch their own errors; no events plus a failed page
+    # means the theater could not be reached rather than "no dates"
+    if not result[0] and None in pages.values():
+        state.pop(show.key, None)
+        raise RuntimeError("no events and at least one page could not be fetched")
+    return result
+
+
+def run_shows(shows, previous_shows, previous_state, state, store, run):
+    """Scrape all shows in parallel into the store
+
+    Returns their shows.json entries, whose events are a view of the
+    upcoming events in the store, and the changes of this run. A failing
+    show keeps its previously published entry and stored events instead
+    of affecting the others.
+    """
+    def task(show):
+        try:
+            events, *details = scrape_show(show, previous_state, state)
+            changes = store.upsert(show.key, events, run)
+            return show.entry((store.show_events(show.key)[:SHOWS_MAX_EVENTS], *details)), changes
+        except Exception as e:
+            print(f"Error scraping {show.title}, keeping previous data: {e}")
+            previous = previous_shows.get(show.key)
+            events = (store.show_events(show.key)
+                      or upcoming_events(previous.get('events', []) if previous else []))
+            if previous:
+                return dict(previous, events=events[:SHOWS_MAX_EVENTS]), []
+            return show.entry((events[:SHOWS_MAX_EVENTS], show.director, show.duration, show.author)), []
+
+    results = run_concurrently({show.key: (lambda show=show: task(show)) for show in shows})
+    entries = {show.key: results[show.key][0] for show in shows}
+    changes = [change for show in shows for change in results[show.key][1]]
+    return entries, changes
+
+
+def print_changes(changes):
+    """Print the added, updated and removed events of this run"""
+    if not changes:
+        print("No event changes since the last run")
+        return
+    print(f"{len(changes)} event changes:")
+    for change in sorted(changes, key=lambda c: (c['show'], c['date'])):
+        print(f"  {change['op']:>6} {change['show']}: {change['date']}")
+
+
 def main():
     """Main scraping function"""
     try:
-        # Get data with directors, duration, and authors
-        dumme_jahre_events, dumme_jahre_director, dumme_jahre_duration = scrape_dnt_weimar_dumme_jahre()
-        sankt_falstaff_events, sankt_falstaff_director, sankt_falstaff_duration, sankt_falstaff_author = scrape_theater_bonn()
-        komet_events, komet_director, komet_duration, komet_author = scrape_staatsschauspiel_dresden()
-        undine_events, undine_director, undine_duration, undine_author = scrape_oper_leipzig()
-        krieg_frieden_events, krieg_frieden_director, krieg_frieden_duration, krieg_frieden_author = scrape_dhaus_krieg_und_frieden()
-        # Der Frieden & Ewige Sonne: derzeit komplett deaktiviert (Aug 2026) –
-        # kein Scrape, auf der Website ausgeblendet via "listed": False.
-        # Zum Reaktivieren: die beiden Aufrufe wieder einkommentieren, die
-        # statischen Werte dadurch ersetzen und "listed" auf True setzen.
-        # der_frieden_events, der_frieden_director, der_frieden_duration, der_frieden_author = scrape_staatstheater_cottbus_der_frieden()
-        # ewige_sonne_events, ewige_sonne_director, ewige_sonne_duration, ewige_sonne_author = scrape_buehnen_bern_ewige_sonne()
-        der_frieden_events, der_frieden_director, der_frieden_duration, der_frieden_author = [], "Christina Friedrich", None, "Peter Hacks"
-        ewige_sonne_events, ewige_sonne_director, ewige_sonne_duration, ewige_sonne_author = [], "Tilmann Köhler", None, "Charles Ferdinand Ramuz"
-        flavio_events, flavio_director, flavio_duration, flavio_author = scrape_oper_frankfurt_flavio()
-        
-        shows_data = {
-            "last_updated": datetime.now().isoformat(),
-            "shows": {
-                "dumme-jahre": {
-                    "title": "Dumme Jahre",
-                    "theater": "Deutsches Nationaltheater Weimar",
-                    "director": dumme_jahre_director,
-                    "duration": dumme_jahre_duration,
-                    "image": "images/dumme-jahre.jpg",
-                    "base_url": "https://www.dnt-weimar.de/de/programm/stueck-detail.php?SID=3520#event-tickets",
-                    "events": dumme_jahre_events
-                },
-                "sankt-falstaff": {
-                    "title": "Sankt Falstaff",
-                    "theater": "Theater Bonn",
-                    "director": sankt_falstaff_director,
-                    "author": sankt_falstaff_author,
-                    "duration": sankt_falstaff_duration,
-                    "image": "images/sankt-falstaff.jpg",
-                    "base_url": "https://www.theater-bonn.de/de/programm/sankt-falstaff/221198#dates-and-tickets",
-                    "events": sankt_falstaff_events
-                },
-                "der-komet": {
-                    "title": "Der Komet",
-                    "theater": "Staatsschauspiel Dresden",
-                    "director": komet_director,
-                    "author": komet_author,
-                    "duration": komet_duration,
-                    "image": "images/der-komet.jpg",
-                    "base_url": "https://tickets.staatsschauspiel-dresden.de/webshop/webticket/eventlist?production=709",
-                    "events": komet_events
-                },
-                "undine": {
-                    "title": "Undine",
-                    "theater": "Oper Leipzig",
-                    "director": undine_director,
-                    "author": undine_author,
-                    "duration": undine_duration,
-                    "image": "images/undine.jpg",
-                    "base_url": "https://www.oper-leipzig.de/de/ensemble/person/susanne-uhl/1902",
-                    "events": undine_events
-                },
-                "krieg-und-frieden": {
-                    "title": "Krieg und Frieden",
-                    "theater": "Düsseldorfer Schauspielhaus",
-                    "director": krieg_frieden_director,
-                    "author": krieg_frieden_author,
-                    "duration": krieg_frieden_duration,
-                    "image": "images/thumbs/krieg-und-frieden.jpg",
-                    "base_url": "https://www.dhaus.de/programm/a-z/krieg-und-frieden/",
-                    "events": krieg_frieden_events
-                },
-                "der-frieden": {
-                    "title": "Der Frieden",
-                    "theater": "Staatstheater Cottbus",
-                    "director": der_frieden_director,
-                    "author": der_frieden_author,
-                    "duration": der_frieden_duration,
-                    "image": "images/thumbs/der-frieden.jpg",
-                    "base_url": "https://www.staatstheater-cottbus.de/de/programm/repertoire/artikel-der_frieden.html",
-                    "listed": False,
-                    "note": "Termine folgen in Kürze",
-                    "events": der_frieden_events
-                },
-                "ewige-sonne": {
-                    "title": "Ewige Sonne",
-                    "theater": "Bühnen Bern",
-                    "director": ewige_sonne_director,
-                    "author": ewige_sonne_author,
-                    "duration": ewige_sonne_duration,
-                    "image": "images/thumbs/ewige-sonne.jpg",
-                    "base_url": "https://buehnenbern.ch/spielplan/programm/ewige-sonne/",
-                    "listed": False,
-                    "note": "Termine folgen in Kürze",
-                    "events": ewige_sonne_events
-                },
-                "flavio": {
-                    "title": "Flavio",
-                    "theater": "Oper Frankfurt",
-                    "director": flavio_director,
-                    "author": flavio_author,
-                    "duration": flavio_duration,
-                    "image": "images/thumbs/flavio.jpg",
-                    "base_url": "https://oper-frankfurt.de/de/spielplan/flavio/",
-                    "events": flavio_events
-                }
-            }
-        }
-        
-        # Ensure data directory exists
-        os.makedirs('data', exist_ok=True)
-        
-        # Save to JSON file
-        with open('data/shows.json', 'w', encoding='utf-8') as f:
-            json.dump(shows_data, f, ensure_ascii=False, indent=2)
+        # The theaters run in parallel; the throttle keeps the delay per host.
+        # Shows whose pages are all unchanged since the last run are not re-parsed.
+        previous_state = load_scrape_state()
+        state = {}
+        # Events are merged into the event log; shows.json is rendered from it
+        store = EventStore()
+        run = datetime.now().isoformat(timespec='seconds')
+        shows, changes = run_shows(SHOWS, load_shows_json(), previous_state, state, store, run)
+        store.save()
+        print_changes(changes)
+
+        # Save to JSON file, but leave it untouched if nothing changed
+        if write_shows_json(shows):
+            print(f"Updated {SHOWS_FILE}")
+        else:
+            print(f"No changes, {SHOWS_FILE} left untouched")
         
         print(f"Scraping completed successfully. Found shows:")
-        for show_id, show_data in shows_data['shows'].items():
+        for show_id, show_data in shows.items():
             event_count = len(show_data['events'])
             director_info = f" (Regie: {show_data['director']})" if show_data['director'] else ""
             print(f"  {show_data['title']}{director_info}: {event_count} upcoming events")
+
+        print_connection_stats()
+        save_scrape_state(state)
+        prune_http_cache()
             
     except Exception as e:
         print(f"Error in main function: {e}")
-        # Create a minimal fallback JSON to prevent complete failure
-        fallback_data = {
-            "last_updated": datetime.now().isoformat(),
-            "shows": {
-                "sankt-falstaff": {
-                    "title": "Sankt Falstaff",
-                    "theater": "Theater Bonn",
-                    "director": None,
-                    "author": None,
-                    "duration": None,
-                    "image": "images/sankt-falstaff.jpg",
-                    "base_url": "https://www.theater-bonn.de/de/programm/sankt-falstaff/221198#dates-and-tickets",
-                    "events": []
-                },
-                "der-komet": {
-                    "title": "Der Komet",
-                    "theater": "Staatsschauspiel Dresden",
-                    "director": None,
-                    "author": None,
-                    "duration": None,
-                    "image": "images/der-komet.jpg",
-                    "base_url": "https://tickets.staatsschauspiel-dresden.de/webshop/webticket/eventlist?production=709",
-                    "events": []
-                },
-                "undine": {
-                    "title": "Undine",
-                    "theater": "Oper Leipzig",
-                    "director": None,
-                    "author": None,
-                    "duration": None,
-                    "image": "images/undine.jpg",
-                    "base_url": "https://www.oper-leipzig.de/de/ensemble/person/susanne-uhl/1902",
-                    "events": []
-                },
-                "krieg-und-frieden": {
-                    "title": "Krieg und Frieden",
-                    "theater": "Düsseldorfer Schauspielhaus",
-                    "director": None,
-                    "author": None,
-                    "duration": None,
-                    "image": "images/thumbs/krieg-und-frieden.jpg",
-                    "base_url": "https://www.dhaus.de/programm/a-z/krieg-und-frieden/",
-                    "events": []
-                },
-                "der-frieden": {
-                    "title": "Der Frieden",
-                    "theater": "Staatstheater Cottbus",
-                    "director": None,
-                    "author": None,
-                    "duration": None,
-                    "image": "images/thumbs/der-frieden.jpg",
-                    "base_url": "https://www.staatstheater-cottbus.de/de/programm/repertoire/artikel-der_frieden.html",
-                    "listed": False,
-                    "note": "Termine folgen in Kürze",
-                    "events": []
-                },
-                "ewige-sonne": {
-                    "title": "Ewige Sonne",
-                    "theater": "Bühnen Bern",
-                    "director": None,
-                    "author": None,
-                    "duration": None,
-                    "image": "images/thumbs/ewige-sonne.jpg",
-                    "base_url": "https://buehnenbern.ch/spielplan/programm/ewige-sonne/",
-                    "listed": False,
-                    "note": "Termine folgen in Kürze",
-                    "events": []
-                },
-                "flavio": {
-                    "title": "Flavio",
-                    "theater": "Oper Frankfurt",
-                    "director": None,
-                    "author": None,
-                    "duration": None,
-                    "image": "images/thumbs/flavio.jpg",
-                    "base_url": "https://oper-frankfurt.de/de/spielplan/flavio/",
-                    "events": []
-                }
-            }
-        }
-
-        os.makedirs('data', exist_ok=True)
-        with open('data/shows.json', 'w', encoding='utf-8') as f:
-            json.dump(fallback_data, f, ensure_ascii=False, indent=2)
-        print("Created fallback JSON due to error")
+        # Create a minimal fallback JSON to prevent complete failure,
+        # but never overwrite previously scraped dates with it
+        if not os.path.exists(SHOWS_FILE):
+            write_shows_json({show.key: show.entry(([], show.director, show.duration, show.author))
+                              for show in SHOWS})
+            print("Created fallback JSON due to error")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,352 @@
+"""
+Tests of the show scraper's fetching and storage.
+
+- concurrency: scrapers run in parallel, but requests to one host keep
+  HostThrottle's delay between them
+- fetch(): a 304 from the conditional-GET cache serves the cached page
+- EventStore appends its changes to events.jsonl
+- write_shows_json() leaves an unchanged shows.json alone
+- extract_dates_from_text() finds the same events as the regex version it
+  replaced (legacy_extract_dates_from_text below)
+
+Local http.server stubs stand in for the theater hosts and record when each
+request arrives.
+
+Usage:
+    python -m pytest tests
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+import scrape_shows  # noqa: E402
+
+DELAY = 0.3
+REQUESTS_PER_HOST = 3
+# Slack for thread start-up and timer resolution on a busy CI runner
+TOLERANCE = 0.05
+
+
+class Host:
+    """A stub server that records the arrival time of every request
+
+    Pages are their path, or body when given; with an etag, a request whose
+    If-None-Match carries it gets a 304 without a body.
+    """
+
+    def __init__(self, body=None, etag=None):
+        self.arrivals = []
+        self.statuses = []
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                host.arrivals.append(time.monotonic())
+                if etag and self.headers.get('If-None-Match') == etag:
+                    host.statuses.append(304)
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                content = body if body is not None else self.path.encode('utf-8')
+                host.statuses.append(200)
+                self.send_response(200)
+                if etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def hosts():
+    stubs = [Host(), Host()]
+    yield stubs
+    for stub in stubs:
+        stub.close()
+
+
+def scrape(throttle, session, host, name):
+    """A scraper that reads several pages of one host, like the real ones do"""
+    def task():
+        pages = []
+        for index in range(REQUESTS_PER_HOST):
+            url = f"{host.url}/{name}/{index}"
+            throttle.wait(url, DELAY, DELAY)
+            pages.append(session.get(url, timeout=5).text)
+        return pages
+    return task
+
+
+def test_requests_to_one_host_keep_the_delay(hosts):
+    throttle = scrape_shows.HostThrottle()
+    session = scrape_shows.create_session(retries=0)
+    scrape_shows.run_concurrently({
+        f"show{index}": scrape(throttle, session, host, f"show{index}")
+        for index, host in enumerate(hosts)
+    })
+
+    for host in hosts:
+        assert len(host.arrivals) == REQUESTS_PER_HOST
+        gaps = [b - a for a, b in zip(host.arrivals, host.arrivals[1:])]
+        assert min(gaps) >= DELAY - TOLERANCE
+
+
+def test_hosts_are_scraped_in_parallel(hosts):
+    throttle = scrape_shows.HostThrottle()
+    session = scrape_shows.create_session(retries=0)
+    start = time.monotonic()
+    scrape_shows.run_concurrently({
+        f"show{index}": scrape(throttle, session, host, f"show{index}")
+        for index, host in enumerate(hosts)
+    })
+    elapsed = time.monotonic() - start
+
+    # Serially the second host would only start after the first one's delays
+    first, second = (host.arrivals[0] for host in hosts)
+    assert abs(first - second) < DELAY
+    assert elapsed < 2 * (REQUESTS_PER_HOST - 1) * DELAY
+
+
+def test_run_concurrently_returns_results_by_key(hosts):
+    throttle = scrape_shows.HostThrottle()
+    session = scrape_shows.create_session(retries=0)
+    results = scrape_shows.run_concurrently({
+        'a': scrape(throttle, session, hosts[0], 'a'),
+        'b': scrape(throttle, session, hosts[1], 'b'),
+    })
+
+    assert results == {key: [f"/{key}/{index}" for index in range(REQUESTS_PER_HOST)]
+                       for key in ('a', 'b')}
+
+
+def test_one_host_shared_by_two_scrapers_is_serialized(hosts):
+    # Two shows on the same theater site must not double its request rate
+    throttle = scrape_shows.HostThrottle()
+    session = scrape_shows.create_session(retries=0)
+    scrape_shows.run_concurrently({
+        'first': scrape(throttle, session, hosts[0], 'first'),
+        'second': scrape(throttle, session, hosts[0], 'second'),
+    })
+
+    arrivals = sorted(hosts[0].arrivals)
+    assert len(arrivals) == 2 * REQUESTS_PER_HOST
+    assert min(b - a for a, b in zip(arrivals, arrivals[1:])) >= DELAY - TOLERANCE
+
+
+# --- fetch -------------------------------------------------------------------
+
+@pytest.fixture
+def http_cache(tmp_path, monkeypatch):
+    """An empty on-disk cache and no pages from earlier fetches of this run"""
+    monkeypatch.setattr(scrape_shows, 'HTTP_CACHE_DIR', str(tmp_path / 'http-cache'))
+    monkeypatch.setattr(scrape_shows, '_run_pages', {})
+    return tmp_path / 'http-cache'
+
+
+def test_304_serves_the_cached_page(http_cache, monkeypatch):
+    host = Host(body=b'<html>Termine</html>', etag='"v1"')
+    try:
+        url = f"{host.url}/spielplan"
+        first = scrape_shows.fetch(url, delay=(0, 0))
+        # The next run starts without the pages fetched by this one
+        monkeypatch.setattr(scrape_shows, '_run_pages', {})
+        second = scrape_shows.fetch(url, delay=(0, 0))
+    finally:
+        host.close()
+
+    assert host.statuses == [200, 304]
+    assert second.content == first.content == b'<html>Termine</html>'
+    assert second.content_hash == first.content_hash
+
+
+def test_pages_of_this_run_are_fetched_once(http_cache):
+    host = Host(etag='"v1"')
+    try:
+        url = f"{host.url}/spielplan"
+        pages = [scrape_shows.fetch(url, delay=(0, 0)) for _ in range(2)]
+    finally:
+        host.close()
+
+    assert host.statuses == [200]
+    assert pages[0] is pages[1]
+
+
+# --- EventStore --------------------------------------------------------------
+
+def event(date):
+    return {"date": date, "display_date": f"{date[8:10]}.{date[5:7]}.{date[:4]}",
+            "display_time": date[11:], "ticket_url": "https://example.org/tickets"}
+
+
+def read_log(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_event_store_appends_changes(tmp_path):
+    path = str(tmp_path / 'events.jsonl')
+    store = scrape_shows.EventStore(path)
+    store.upsert('macbeth', [event('2099-03-01 19:30'), event('2099-03-02 19:30')], 'run1')
+    assert store.save() == 2
+
+    # A new run replays the log; a moved date is one removal and one addition
+    store = scrape_shows.EventStore(path)
+    assert [e['date'] for e in store.show_events('macbeth')] == ['2099-03-01 19:30', '2099-03-02 19:30']
+    store.upsert('macbeth', [event('2099-03-01 19:30'), event('2099-03-03 18:00')], 'run2')
+    assert store.save() == 2
+
+    log = read_log(path)
+    assert [(c['run'], c['op'], c['date']) for c in log] == [
+        ('run1', 'add', '2099-03-01 19:30'),
+        ('run1', 'add', '2099-03-02 19:30'),
+        ('run2', 'add', '2099-03-03 18:00'),
+        ('run2', 'remove', '2099-03-02 19:30'),
+    ]
+
+
+def test_event_store_writes_nothing_without_changes(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    store = scrape_shows.EventStore(str(path))
+    store.upsert('macbeth', [event('2099-03-01 19:30')], 'run1')
+    store.save()
+    before = path.read_bytes()
+
+    store = scrape_shows.EventStore(str(path))
+    assert store.upsert('macbeth', [event('2099-03-01 19:30')], 'run2') == []
+    assert store.save() == 0
+    assert path.read_bytes() == before
+
+
+# --- write_shows_json --------------------------------------------------------
+
+def test_unchanged_shows_are_not_written(tmp_path):
+    path = tmp_path / 'shows.json'
+    shows = {'macbeth': {'title': 'Macbeth', 'events': [event('2099-03-01 19:30')]}}
+    assert scrape_shows.write_shows_json(shows, str(path)) is True
+    before = path.read_bytes()
+
+    assert scrape_shows.write_shows_json(json.loads(json.dumps(shows)), str(path)) is False
+    assert path.read_bytes() == before
+
+    shows['macbeth']['events'].append(event('2099-03-02 19:30'))
+    assert scrape_shows.write_shows_json(shows, str(path)) is True
+    assert json.loads(path.read_text(encoding='utf-8'))['shows'] == shows
+
+
+# --- extract_dates_from_text -------------------------------------------------
+
+def legacy_extract_dates_from_text(text, base_url):
+    """extract_dates_from_text() before the single-pass scan, as the reference"""
+    events = []
+    normalized_text = re.sub(r'\s+', ' ', text)
+    patterns = [
+        r'(\d{1,2})\.(\d{1,2})\.(\d{4}).*?(\d{1,2})[:\.](\d{2})',
+        r'(\d{1,2})\.(\d{1,2})\.(\d{4})',
+        r'(\d{1,2})\.\s*(Januar|Februar|März|April|Mai|Juni|Juli|August|September|Oktober|November|Dezember)\s*(\d{4})',
+        r'(\d{1,2})\s+(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez|Januar|Februar|März|April|Juni|Juli|August|September|Oktober|November|Dezember)\s+(\d{4})',
+        r'(\d{1,2})\.\s*(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez|Januar|Februar|März|April|Juni|Juli|August|September|Oktober|November|Dezember)',
+        r'(\d{1,2})\s+(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez)\s+(?!202)',
+    ]
+    month_map = scrape_shows.MONTH_NAME_MAP
+    for pattern in patterns:
+        for match in re.finditer(pattern, normalized_text):
+            try:
+                groups = match.groups()
+                if len(groups) == 5:
+                    day, month, year, hour, minute = groups
+                    datetime_str = f"{year}-{month.zfill(2)}-{day.zfill(2)} {hour.zfill(2)}:{minute.zfill(2)}"
+                    time_display = f"{hour}:{minute}"
+                else:
+                    if groups[1].isalpha():
+                        day, month_name = groups[:2]
+                        month = month_map.get(month_name, '01')
+                        if len(groups) == 3:
+                            year = groups[2]
+                        else:
+                            year = datetime.now().year
+                            test_date = datetime.strptime(f"{year}-{month}-{day.zfill(2)}", "%Y-%m-%d")
+                            if test_date < datetime.now() - timedelta(days=90):
+                                year += 1
+                    else:
+                        day, month, year = groups[:3]
+                    text_after = normalized_text[match.end():match.end() + 100]
+                    time_match = re.search(r'(?:\bum\s+)?(\d{1,2})[:\.](\d{2})(?:\s*Uhr)?', text_after)
+                    if not time_match:
+                        continue
+                    h, m = time_match.groups()
+                    time_display = f"{h.zfill(2)}:{m.zfill(2)}"
+                    datetime_str = f"{year}-{month.zfill(2)}-{day.zfill(2)} {time_display}"
+                if datetime.strptime(datetime_str, "%Y-%m-%d %H:%M") > datetime.now():
+                    events.append({
+                        "date": datetime_str,
+                        "display_date": f"{day.zfill(2)}.{month.zfill(2)}.{year}",
+                        "display_time": time_display,
+                        "ticket_url": base_url
+                    })
+            except Exception:
+                continue
+    return events
+
+
+def _in_days(days):
+    """'D. Mon' of a date days from today, for dates without a year"""
+    date = datetime.now() + timedelta(days=days)
+    short = {v: k for k, v in scrape_shows.MONTH_NAME_MAP.items() if len(k) == 3 or k == 'Mai'}
+    return f"{date.day}. {short[f'{date.month:02d}']}"
+
+
+DATE_TEXTS = [
+    # Listing rows as the theater pages render them
+    "Sa 14.03.2099 19:30 Uhr Großes Haus Tickets",
+    "14.3.2099\n\n  19.30 Uhr\n\tPremiere",
+    "So 15.03.2099 | 18:00 Uhr · Mo 16.03.2099 | 19:30 Uhr · Di 17.03.2099 um 20:00",
+    # A date without a time on the row takes the next one further down
+    "Termine: 01.02.2099 und 03.04.2099 Beginn 19:30",
+    "20. September 2099, 19:30 Uhr",
+    "20.September 2099 um 18.00",
+    "17 Okt 2099 20:00 Kammerspiele",
+    "17 Oktober 2099 – Beginn 19:00 Uhr",
+    f"{_in_days(30)} 19:30 Uhr, {_in_days(31)} 18:00 Uhr",
+    f"Premiere {_in_days(40)} | weitere Termine {_in_days(45)} 19.30",
+    "Dauer: ca. 2 Std. 30 Min., 1 Pause – 12. Dez um 19.30",
+    # A time far after the date counts for DD.MM.YYYY rows only
+    "21.06.2099 " + "x" * 120 + " 19:30",
+    "Spielzeit 2025/26, Stand 01.01.2020 10:00",
+    # Not dates
+    "Einlass 18:30, Preise 12.50 bis 45.00 Euro",
+    "",
+]
+
+
+@pytest.mark.parametrize('text', DATE_TEXTS)
+def test_single_pass_extractor_matches_the_regex_version(text):
+    url = "https://example.org/spielplan"
+    assert scrape_shows.extract_dates_from_text(text, url) == legacy_extract_dates_from_text(text, url)
+
+
+def test_single_pass_extractor_finds_dates():
+    found = scrape_shows.extract_dates_from_text(DATE_TEXTS[2], "https://example.org")
+    # Rows with a date and a time match two patterns; callers drop the repeats
+    assert sorted({e['date'] for e in found}) == ['2099-03-15 18:00', '2099-03-16 19:30', '2099-03-17 20:00']